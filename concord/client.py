@@ -22,58 +22,163 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import logging
-from typing import Type
+from typing import Dict, List, Optional, Type
 
 import discord
 
 from concord.constants import EventType
 from concord.context import Context
+from concord.dispatcher import Dispatcher, TaskDispatcher
 from concord.extension import Manager
 from concord.utils import empty_next_callable
 
 
 log = logging.getLogger(__name__)
 
+# Lookup table is cheaper than enum lookup with exception handling.
+_EVENT_TYPES = {event_type.value: event_type for event_type in EventType}
+
 
 class Client(discord.Client):
     """Wrapper around default discord.py library client.
 
+    With enabled guild availability batching, the client dispatches
+    ``GUILD_AVAILABLE_BATCH`` event with a list of guilds. On connecting, guilds
+    are collected until the shard is ready, and a batch is dispatched once per
+    shard. After that, every available guild is dispatched in a separate
+    batch. Usual ``GUILD_AVAILABLE`` events are dispatched as well, but they can
+    be suppressed for extensions, that process batches (see
+    :class:`concord.extension.Manager`).
+
+    Args:
+        dispatcher: Event dispatcher to use. By default, every event is
+            processed in a separate task (see
+            :class:`concord.dispatcher.TaskDispatcher`).
+        extension_manager: Extension manager to use. By default, a new one is
+            created.
+        batch_guild_available: Enable guild availability batching.
+        timeouts: Event processing timeouts by event type, in seconds. The
+            deadline is set to the context on dispatching (see
+            :meth:`concord.context.Context.set_timeout`).
+
     Attributes:
         extension_manager: Extension manager instance associated with this
             client.
+        dispatcher: Event dispatcher, that schedules events processing.
+        batch_guild_available: Is guild availability batching enabled.
+        timeouts: Event processing timeouts by event type, in seconds.
     """
 
     extension_manager: Manager
-
-    def __init__(self, *args, **kwargs):
+    dispatcher: Dispatcher
+    batch_guild_available: bool
+    timeouts: Dict[EventType, float]
+
+    _guild_batching: bool
+    _guild_batches: Dict[Optional[int], List[discord.Guild]]
+
+    def __init__(
+        self,
+        *args,
+        dispatcher: Optional[Dispatcher] = None,
+        extension_manager: Optional[Manager] = None,
+        batch_guild_available: bool = False,
+        timeouts: Optional[Dict[EventType, float]] = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
-        self.extension_manager = Manager()
+        self.extension_manager = (
+            Manager() if extension_manager is None else extension_manager
+        )
+        self.dispatcher = TaskDispatcher() if dispatcher is None else dispatcher
+        self.dispatcher.bind(self)
+        self.batch_guild_available = batch_guild_available
+        self.timeouts = {} if timeouts is None else timeouts
+
+        self._guild_batching = True
+        self._guild_batches = {}
 
         log.info("Concord client initialized")
 
     def dispatch(self, event: str, *args, **kwargs):  # noqa: D401
-        """Wrapper around default event dispatcher for a client."""
+        """Wrapper around default event dispatcher for a client.
+
+        Events, that can't be processed by any of registered extensions, are
+        skipped.
+        """
         super().dispatch(event, *args, **kwargs)
 
-        try:
-            event_type = EventType(event)
-        except ValueError:
-            event_type = EventType.UNKNOWN
+        event_type = _EVENT_TYPES.get(event, EventType.UNKNOWN)
+        if self.batch_guild_available:
+            self._batch_guild_available(event_type, args)
+        if not self.extension_manager.can_process(event_type):
+            return
         #
-        ctx = Context(self, event_type, *args, **kwargs)
+        ctx = self._create_context(event_type, *args, **kwargs)
         log.debug(f"Dispatching event `{event_type}`")
 
-        self.loop.create_task(
-            self._run_event(
-                self.extension_manager.run,
-                event,
-                ctx=ctx,
-                next=empty_next_callable,
-            )
+        self.dispatcher.dispatch(event, ctx)
+
+    def _create_context(self, event_type: EventType, *args, **kwargs):
+        """Creates a context for the event with the event's deadline."""
+        ctx = Context(self, event_type, *args, **kwargs)
+        timeout = self.timeouts.get(event_type)
+        if timeout is not None:
+            ctx.set_timeout(timeout)
+        return ctx
+
+    def _batch_guild_available(self, event_type: EventType, args: tuple):
+        """Collects available guilds and dispatches batches of them."""
+        if event_type == EventType.CONNECT:
+            self._guild_batching = True
+        elif event_type == EventType.GUILD_AVAILABLE:
+            guild = args[0]
+            if self._guild_batching:
+                shard_id = getattr(guild, "shard_id", None)
+                self._guild_batches.setdefault(shard_id, []).append(guild)
+            else:
+                self._dispatch_guild_batch([guild])
+        elif event_type == EventType.SHARD_READY:
+            self._dispatch_guild_batch(self._guild_batches.pop(args[0], []))
+        elif event_type == EventType.READY:
+            self._guild_batching = False
+            for guilds in self._guild_batches.values():
+                self._dispatch_guild_batch(guilds)
+            self._guild_batches.clear()
+
+    def _dispatch_guild_batch(self, guilds: List[discord.Guild]):
+        """Dispatches a batch of available guilds."""
+        event_type = EventType.GUILD_AVAILABLE_BATCH
+        if not guilds or not self.extension_manager.can_process(event_type):
+            return
+        #
+        ctx = self._create_context(event_type, guilds)
+        log.debug(f"Dispatching event `{event_type}` of {len(guilds)} guilds")
+
+        self.dispatcher.dispatch(event_type.value, ctx)
+
+    async def process_event(self, event: str, ctx: Context):
+        """Processes the event by the extension manager.
+
+        Exceptions are handled by the client's ``on_error`` handler.
+
+        Args:
+            event: Event's name, as it was dispatched by discord.py.
+            ctx: Event processing context.
+        """
+        await self._run_event(
+            self.extension_manager.run, event, ctx=ctx, next=empty_next_callable
         )
+        if ctx.timed_out:
+            log.warning(f"Processing of event `{ctx.event}` has been timed out")
+
+    async def close(self):  # noqa: D102
+        await super().close()
+        await self.dispatcher.close()
+        await self.extension_manager.close()
 
 
-def create_client(client: Type[discord.Client]):
+def create_client(client: Type[discord.Client], *args, **kwargs):
     """Get an instance of client.
 
     It returns an instance of subclass, that is based on your provided class and
@@ -82,9 +187,11 @@ def create_client(client: Type[discord.Client]):
 
     Args:
         client: Client class to base on.
+        *args: Positional arguments to instantiate the client with.
+        **kwargs: Keyword arguments to instantiate the client with.
     """
 
     class MixedClient(Client, client):
         pass
 
-    return MixedClient()
+    return MixedClient(*args, **kwargs)
@@ -22,10 +22,18 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import enum
+from typing import Dict, Tuple
 
 
 class EventType(enum.Enum):
-    """List of event types which can be received."""
+    """List of event types which can be received.
+
+    Most of event types are dispatched by discord.py, but some of them are
+    dispatched by the client itself:
+
+    * ``GUILD_AVAILABLE_BATCH`` - list of guilds, that became available. See
+      :class:`concord.client.Client` for more information.
+    """
 
     UNKNOWN = None
 
@@ -34,6 +42,7 @@ class EventType(enum.Enum):
     GROUP_JOIN = "group_join"
     GROUP_REMOVE = "group_remove"
     GUILD_AVAILABLE = "guild_available"
+    GUILD_AVAILABLE_BATCH = "guild_available_batch"
     GUILD_CHANNEL_CREATE = "guild_channel_create"
     GUILD_CHANNEL_DELETE = "guild_channel_delete"
     GUILD_CHANNEL_PINS_UPDATE = "guild_channel_pins_update"
@@ -79,3 +88,67 @@ class EventType(enum.Enum):
     TYPING = "typing"
     VOICE_STATE_UPDATE = "voice_state_update"
     WEBHOOKS_UPDATE = "webhooks_update"
+
+
+class Priority(enum.IntEnum):
+    """Enum values for event processing priorities."""
+
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+
+# Fields list each event has. Positional event arguments are named in order.
+EVENT_FIELDS: Dict[EventType, Tuple[str, ...]] = {
+    EventType.CONNECT: tuple(),
+    EventType.ERROR: tuple(),
+    EventType.GROUP_JOIN: ("channel", "user"),
+    EventType.GROUP_REMOVE: ("channel", "user"),
+    EventType.GUILD_AVAILABLE: ("guild",),
+    EventType.GUILD_AVAILABLE_BATCH: ("guilds",),
+    EventType.GUILD_CHANNEL_CREATE: ("channel",),
+    EventType.GUILD_CHANNEL_DELETE: ("channel",),
+    EventType.GUILD_CHANNEL_PINS_UPDATE: ("channel", "last_pin"),
+    EventType.GUILD_CHANNEL_UPDATE: ("before", "after"),
+    EventType.GUILD_EMOJIS_UPDATE: ("guild", "before", "after"),
+    EventType.GUILD_JOIN: ("guild",),
+    EventType.GUILD_REMOVE: ("guild",),
+    EventType.GUILD_ROLE_CREATE: ("role",),
+    EventType.GUILD_ROLE_DELETE: ("role",),
+    EventType.GUILD_ROLE_UPDATE: ("before", "after"),
+    EventType.GUILD_UNAVAILABLE: ("guild",),
+    EventType.GUILD_UPDATE: ("before", "after"),
+    EventType.MEMBER_BAN: ("guild", "user"),
+    EventType.MEMBER_JOIN: ("member",),
+    EventType.MEMBER_REMOVE: ("member",),
+    EventType.MEMBER_UNBAN: ("guild", "user"),
+    EventType.MEMBER_UPDATE: ("before", "after"),
+    EventType.MESSAGE: ("message",),
+    EventType.MESSAGE_DELETE: ("message",),
+    EventType.MESSAGE_EDIT: ("before", "after"),
+    EventType.PRIVATE_CHANNEL_CREATE: ("channel",),
+    EventType.PRIVATE_CHANNEL_DELETE: ("channel",),
+    EventType.PRIVATE_CHANNEL_PINS_UPDATE: ("channel", "last_pin"),
+    EventType.PRIVATE_CHANNEL_UPDATE: ("before", "after"),
+    EventType.RAW_BULK_MESSAGE_DELETE: ("payload",),
+    EventType.RAW_MESSAGE_DELETE: ("payload",),
+    EventType.RAW_MESSAGE_EDIT: ("payload",),
+    EventType.RAW_REACTION_ADD: ("payload",),
+    EventType.RAW_REACTION_CLEAR: ("payload",),
+    EventType.RAW_REACTION_REMOVE: ("payload",),
+    EventType.REACTION_ADD: ("reaction", "user"),
+    EventType.REACTION_CLEAR: ("message", "reactions"),
+    EventType.REACTION_REMOVE: ("reaction, user",),
+    EventType.READY: tuple(),
+    EventType.RELATIONSHIP_ADD: ("relationship",),
+    EventType.RELATIONSHIP_REMOVE: ("relationship",),
+    EventType.RELATIONSHIP_UPDATE: ("before", "after"),
+    EventType.RESUMED: tuple(),
+    EventType.SHARD_READY: ("shard_id",),
+    EventType.SOCKET_RAW_RECEIVE: ("msg",),
+    EventType.SOCKET_RAW_SEND: ("payload",),
+    EventType.SOCKET_RESPONSE: ("playload",),
+    EventType.TYPING: ("channel", "user", "timestamp"),
+    EventType.VOICE_STATE_UPDATE: ("member", "before", "after"),
+    EventType.WEBHOOKS_UPDATE: ("channel",),
+}
@@ -21,11 +21,12 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import discord
 
-from concord.constants import EventType
+from concord.constants import EVENT_FIELDS, EventType
 
 
 class Context:
@@ -34,6 +35,15 @@ class Context:
     .. note::
         Attributes ``client`` and ``event`` are not supposed to be changed.
 
+    Context can carry a deadline, after which the event processing should be
+    stopped (see :meth:`set_timeout`). Middleware collections stop invoking
+    further middleware, once the deadline is expired, and mark the context as
+    timed out. Time is measured by :func:`time.monotonic`.
+
+    Positional arguments are kept as they were provided, and named fields of
+    known events (see :data:`concord.constants.EVENT_FIELDS`) are built from
+    them only on first access (see :attr:`fields`).
+
     Args:
         client: A discord.py client instance.
         event: Event's type context is creating for.
@@ -43,19 +53,77 @@ class Context:
     Attributes:
         client: The discord.py client instance.
         event: Event's type context is created for.
-        args: Unnamed / positional arguments, which was provided with event.
+        args: Unnamed / positional arguments, which was provided with event, as
+            a tuple.
         kwargs: Keyword arguments, which was provided with event.
+        deadline: Time, after which the event processing should be stopped,
+            or ``None``, if there is no deadline.
+        timed_out: Is the event processing has been stopped due to expired
+            deadline.
+        states: States, provided by middleware, by slot index, or ``None``, if
+            there is no states yet (see
+            :class:`concord.middleware.MiddlewareState`).
     """
 
+    __slots__ = (
+        "client",
+        "event",
+        "args",
+        "kwargs",
+        "deadline",
+        "timed_out",
+        "states",
+        "_fields",
+    )
+
     client: discord.Client
     event: EventType
-    args: List
+    args: Tuple
     kwargs: Dict[str, Any]
+    deadline: Optional[float]
+    timed_out: bool
+    states: Optional[List[Any]]
+
+    _fields: Optional[Dict[str, Any]]
 
     def __init__(
         self, client: discord.Client, event: EventType, *args, **kwargs
     ):
         self.client = client
         self.event = event
-        self.args = list(args)
+        self.args = args
         self.kwargs = kwargs
+        self.deadline = None
+        self.timed_out = False
+        self.states = None
+        self._fields = None
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        """Named fields of the event, built from positional arguments. It is
+        empty for unknown events."""
+        if self._fields is None:
+            names = EVENT_FIELDS.get(self.event, ())
+            self._fields = dict(zip(names, self.args))
+        return self._fields
+
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        """Sets the deadline in given number of seconds from now.
+
+        Args:
+            timeout: Number of seconds, or ``None`` to remove the deadline.
+        """
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Number of seconds until the deadline, or ``None``, if there is no
+        deadline. It is never negative."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Is the deadline expired."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
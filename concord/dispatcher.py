@@ -0,0 +1,962 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import abc
+import asyncio
+import collections
+import enum
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Counter,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import discord
+
+from concord.constants import EVENT_FIELDS, EventType, Priority
+from concord.context import Context
+from concord.extension import Manager
+from concord.utils import empty_next_callable, from_plain_data, to_plain_data
+
+
+log = logging.getLogger(__name__)
+
+
+class Dispatcher(abc.ABC):
+    """Event dispatcher. Decides, when and how events will be processed.
+
+    Client passes every event to the dispatcher, and the dispatcher should
+    process it using :meth:`concord.client.Client.process_event`.
+
+    Attributes:
+        client: The client instance, dispatcher is bound to.
+    """
+
+    client: Optional[discord.Client]
+
+    def __init__(self):
+        self.client = None
+
+    def bind(self, client: discord.Client) -> None:
+        """Binds the dispatcher to the client.
+
+        Args:
+            client: A client instance to bind to.
+        """
+        self.client = client
+
+    @abc.abstractmethod
+    def dispatch(self, event: str, ctx: Context) -> None:
+        """Schedules the event processing.
+
+        Args:
+            event: Event's name, as it was dispatched by discord.py.
+            ctx: Event processing context.
+        """
+        pass  # pragma: no cover
+
+    async def close(self) -> None:
+        """Stops the dispatcher and releases its resources."""
+        pass
+
+
+class TaskDispatcher(Dispatcher):
+    """Dispatcher, that processes every event in a separate task.
+
+    It is the default dispatcher. There is no limits on a number of events,
+    processing at the same time.
+    """
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        self.client.loop.create_task(self.client.process_event(event, ctx))
+
+
+class OverflowPolicy(enum.Enum):
+    """Enum values for behavior of a dispatcher on a full queue.
+
+    ``BLOCK`` policy holds events outside of the queue until there is a free
+    place. Take a note, that discord.py dispatches events synchronously, so
+    there is no way to block the gateway itself. Number of held events is
+    limited as well, events over the limit are dropped.
+    ``DROP_OLDEST`` policy drops the oldest event in the queue.
+    ``DROP_NEWEST`` policy drops the event, that is being dispatched.
+    """
+
+    BLOCK = enum.auto()
+    DROP_OLDEST = enum.auto()
+    DROP_NEWEST = enum.auto()
+
+
+class SheddingPolicy(enum.Enum):
+    """Enum values for behavior of a dispatcher on a late event.
+
+    ``DROP`` policy drops the event.
+    ``SAMPLE`` policy processes only some of events and drops the rest.
+    ``DEFER`` policy processes the event later, when the queue is empty.
+    """
+
+    DROP = enum.auto()
+    SAMPLE = enum.auto()
+    DEFER = enum.auto()
+
+
+class QueueDispatcher(Dispatcher):
+    """Dispatcher, that processes events by a fixed pool of workers.
+
+    Events are placed into a bounded queue and processed in order of
+    dispatching. Workers are started on the first dispatched event.
+
+    If an event has been waiting in the queue for longer than the latency SLO,
+    it is shed according to the shedding policy for its event type. Events
+    without a shedding policy are never shed. Deferred events are kept in a
+    separate queue of the same size, on its overflow the oldest event is
+    dropped (it is counted as dropped, not as shed once again).
+
+    Events, held by ``BLOCK`` policy, are kept in a backlog of limited size, so
+    memory usage stays flat under load. On a full backlog, the event, that is
+    being dispatched, is dropped.
+
+    Subclasses can change the queue discipline by overriding :meth:`_push`,
+    :meth:`_pop`, :meth:`_evict` and :meth:`_queued` methods.
+
+    Args:
+        size: Maximum number of events in the queue.
+        workers: Number of workers, processing events at the same time.
+        policy: Behavior on a full queue.
+        backlog_size: Maximum number of events, held by ``BLOCK`` policy.
+        slo: Maximum time in seconds, events should wait in the queue.
+        shedding: Behavior on a late event for event types.
+        sample_rate: Process every n-th late event with ``SAMPLE`` policy.
+
+    Attributes:
+        size: Maximum number of events in the queue.
+        workers: Number of workers, processing events at the same time.
+        policy: Behavior on a full queue.
+        backlog_size: Maximum number of events, held by ``BLOCK`` policy.
+        slo: Maximum time in seconds, events should wait in the queue.
+        shedding: Behavior on a late event for event types.
+        sample_rate: Process every n-th late event with ``SAMPLE`` policy.
+        dropped: Number of events, dropped due to a full queue (including the
+            backlog and the queue of deferred events).
+        shed: Number of shed events for event types.
+        wait_time: Time in seconds, the last processed event has been waiting
+            in the queue.
+    """
+
+    Item = Tuple[str, Context, float]
+
+    size: int
+    workers: int
+    policy: OverflowPolicy
+    backlog_size: int
+    slo: Optional[float]
+    shedding: Dict[EventType, SheddingPolicy]
+    sample_rate: int
+    dropped: int
+    shed: Counter
+    wait_time: float
+
+    _queue: Deque[Item]
+    _backlog: Deque[Item]
+    _deferred: Deque[Item]
+    _sampled: Counter
+    _available: Optional[asyncio.Semaphore]
+    _tasks: List[asyncio.Task]
+
+    def __init__(
+        self,
+        *,
+        size: int = 1000,
+        workers: int = 10,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        backlog_size: int = 10000,
+        slo: Optional[float] = None,
+        shedding: Optional[Dict[EventType, SheddingPolicy]] = None,
+        sample_rate: int = 10,
+    ):
+        super().__init__()
+
+        if size < 1:
+            raise ValueError("Queue size should be positive")
+        if workers < 1:
+            raise ValueError("Workers number should be positive")
+        if backlog_size < 0:
+            raise ValueError("Backlog size should not be negative")
+        if sample_rate < 1:
+            raise ValueError("Sample rate should be positive")
+
+        self.size = size
+        self.workers = workers
+        self.policy = policy
+        self.backlog_size = backlog_size
+        self.slo = slo
+        self.shedding = {} if shedding is None else shedding
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self.shed = collections.Counter()
+        self.wait_time = 0.0
+
+        self._queue = collections.deque()
+        self._backlog = collections.deque()
+        self._deferred = collections.deque()
+        self._sampled = collections.Counter()
+        self._available = None
+        self._tasks = []
+
+    def __len__(self) -> int:
+        """Returns number of events, waiting for processing."""
+        return self._queued() + len(self._backlog) + len(self._deferred)
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        if not self._tasks:
+            self._start()
+
+        item = (event, ctx, self.client.loop.time())
+
+        # Keep the order of blocked events, new events should wait as well.
+        if self._queued() < self.size and not self._backlog:
+            self._push(item)
+            self._available.release()
+        elif self.policy == OverflowPolicy.BLOCK:
+            if len(self._backlog) < self.backlog_size:
+                self._backlog.append(item)
+            else:
+                self._drop(item)
+        elif self.policy == OverflowPolicy.DROP_OLDEST:
+            self._push(item)
+            self._drop(self._evict())
+        else:
+            self._drop(item)
+
+    async def close(self) -> None:  # noqa: D102
+        tasks, self._tasks = self._tasks, []
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if len(self) > 0:
+            log.warning(f"Dispatcher closed with {len(self)} pending events")
+        while self._queued() > 0:
+            self._pop()
+        self._backlog.clear()
+        self._deferred.clear()
+
+    def _queued(self) -> int:
+        """Returns number of events in the queue."""
+        return len(self._queue)
+
+    def _push(self, item: Item) -> None:
+        """Puts the event into the queue."""
+        self._queue.append(item)
+
+    def _pop(self) -> Item:
+        """Takes the next event to process from the queue."""
+        return self._queue.popleft()
+
+    def _evict(self) -> Item:
+        """Takes the event to drop from the queue, when it is overflowed."""
+        return self._queue.popleft()
+
+    def _start(self) -> None:
+        """Starts workers."""
+        self._available = asyncio.Semaphore(0)
+        self._tasks = [
+            self.client.loop.create_task(self._work())
+            for _ in range(self.workers)
+        ]
+
+    def _drop(self, item: Item) -> None:
+        """Drops the event due to a full queue."""
+        self.dropped += 1
+        log.debug(f"Event `{item[1].event}` dropped due to a full queue")
+
+    def _shed(self, item: Item) -> bool:
+        """Sheds the event, if it is late. Returns ``True``, if the event has
+        been shed."""
+        event, ctx, enqueued_at = item
+        if self.slo is None:
+            return False
+
+        wait_time = self.client.loop.time() - enqueued_at
+        if wait_time <= self.slo:
+            return False
+
+        shedding = self.shedding.get(ctx.event)
+        if shedding is None:
+            return False
+        if shedding == SheddingPolicy.SAMPLE:
+            self._sampled[ctx.event] += 1
+            if self._sampled[ctx.event] % self.sample_rate == 0:
+                return False
+        elif shedding == SheddingPolicy.DEFER:
+            if len(self._deferred) >= self.size:
+                # It has been counted as shed on deferring already
+                self._drop(self._deferred.popleft())
+            self._deferred.append(item)
+
+        self._count_shed(item, shedding)
+        return True
+
+    def _count_shed(self, item: Item, shedding: SheddingPolicy) -> None:
+        """Counts the shed event."""
+        event_type = item[1].event
+        self.shed[event_type] += 1
+        log.debug(f"Event `{event_type}` shed with `{shedding}` policy")
+
+    async def _work(self) -> None:
+        """Worker's main loop."""
+        loop = self.client.loop
+
+        while True:
+            await self._available.acquire()
+            item = self._pop()
+
+            if self._backlog:
+                self._push(self._backlog.popleft())
+                self._available.release()
+
+            if not self._shed(item):
+                event, ctx, enqueued_at = item
+                self.wait_time = loop.time() - enqueued_at
+                await self.client.process_event(event, ctx)
+
+            # Deferred events are processed only when there is nothing else.
+            while self._deferred and not self._queued():
+                event, ctx, _ = self._deferred.popleft()
+                await self.client.process_event(event, ctx)
+
+
+#: Default priorities for :class:`PriorityDispatcher`. Events, that are usually
+#: caused by users, have high priority. Events, that are massively sent on
+#: connecting, and low-level gateway events have low priority.
+DEFAULT_PRIORITIES = {
+    EventType.MESSAGE: Priority.HIGH,
+    EventType.MESSAGE_DELETE: Priority.HIGH,
+    EventType.MESSAGE_EDIT: Priority.HIGH,
+    EventType.RAW_MESSAGE_DELETE: Priority.HIGH,
+    EventType.RAW_MESSAGE_EDIT: Priority.HIGH,
+    EventType.RAW_REACTION_ADD: Priority.HIGH,
+    EventType.RAW_REACTION_REMOVE: Priority.HIGH,
+    EventType.REACTION_ADD: Priority.HIGH,
+    EventType.REACTION_REMOVE: Priority.HIGH,
+    EventType.GUILD_AVAILABLE: Priority.LOW,
+    EventType.MEMBER_JOIN: Priority.LOW,
+    EventType.MEMBER_UPDATE: Priority.LOW,
+    EventType.SOCKET_RAW_RECEIVE: Priority.LOW,
+    EventType.SOCKET_RAW_SEND: Priority.LOW,
+    EventType.SOCKET_RESPONSE: Priority.LOW,
+    EventType.TYPING: Priority.LOW,
+    EventType.VOICE_STATE_UPDATE: Priority.LOW,
+}
+
+#: Default weights for :class:`PriorityDispatcher`.
+DEFAULT_WEIGHTS = {Priority.HIGH: 6, Priority.NORMAL: 3, Priority.LOW: 1}
+
+
+class PriorityDispatcher(QueueDispatcher):
+    """Dispatcher, that processes events by a fixed pool of workers, with
+    respect to events priorities.
+
+    Each priority has its own lane in the queue. Workers take events from lanes
+    by weighted round robin, so high priority events are processed sooner,
+    while low priority events are not starved.
+
+    Event priority is taken from the extension manager first (see
+    :attr:`concord.extension.Extension.event_priorities`), then from given
+    priorities. All of the other events have normal priority.
+
+    On a full queue with ``DROP_OLDEST`` policy, the oldest event of the lowest
+    priority is dropped. Events, blocked by ``BLOCK`` policy, are waiting in
+    order of dispatching, regardless of priority.
+
+    Args:
+        priorities: Event type priorities. By default,
+            :data:`DEFAULT_PRIORITIES` are used.
+        weights: Priority weights. By default, :data:`DEFAULT_WEIGHTS` are
+            used.
+        **kwargs: Keyword arguments for :class:`QueueDispatcher`.
+
+    Attributes:
+        priorities: Event type priorities.
+        weights: Priority weights.
+    """
+
+    priorities: Dict[EventType, Priority]
+    weights: Dict[Priority, int]
+
+    _lanes: Dict[Priority, Deque[QueueDispatcher.Item]]
+    _current_weights: Dict[Priority, int]
+
+    def __init__(
+        self,
+        *,
+        priorities: Optional[Dict[EventType, Priority]] = None,
+        weights: Optional[Dict[Priority, int]] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.priorities = (
+            DEFAULT_PRIORITIES if priorities is None else priorities
+        )
+        self.weights = DEFAULT_WEIGHTS if weights is None else weights
+
+        if any(self.weights.get(p, 0) < 1 for p in Priority):
+            raise ValueError("Weights should be positive for every priority")
+
+        self._lanes = {priority: collections.deque() for priority in Priority}
+        self._current_weights = {priority: 0 for priority in Priority}
+
+    def get_priority(self, event: EventType) -> Priority:
+        """Returns a priority for given event type."""
+        priority = self.client.extension_manager.event_priorities.get(event)
+        if priority is None:
+            priority = self.priorities.get(event, Priority.NORMAL)
+        return priority
+
+    def _queued(self) -> int:  # noqa: D102
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def _push(self, item: QueueDispatcher.Item) -> None:  # noqa: D102
+        self._lanes[self.get_priority(item[1].event)].append(item)
+
+    def _pop(self) -> QueueDispatcher.Item:  # noqa: D102
+        # Smooth weighted round robin over non-empty lanes.
+        total = 0
+        selected = None
+
+        for priority, lane in self._lanes.items():
+            if not lane:
+                continue
+            weight = self.weights[priority]
+            total += weight
+            self._current_weights[priority] += weight
+            if (
+                selected is None
+                or self._current_weights[priority]
+                > self._current_weights[selected]
+            ):
+                selected = priority
+        #
+        self._current_weights[selected] -= total
+        return self._lanes[selected].popleft()
+
+    def _evict(self) -> QueueDispatcher.Item:  # noqa: D102
+        for priority in sorted(self._lanes):
+            if self._lanes[priority]:
+                return self._lanes[priority].popleft()
+
+
+class KeyedDispatcher(Dispatcher):
+    """Dispatcher, that processes events with the same key one by one.
+
+    Events are routed to lanes by the key. Each lane processes its events in
+    order of dispatching, while different lanes are processed concurrently.
+    Lane is removed, when there is no events left in it.
+
+    Events without a key (``None`` value) are processed in separate tasks.
+
+    .. seealso::
+        :func:`channel_key` and :func:`guild_key` helpers.
+
+    Args:
+        key: A function, that returns a key for given event processing context.
+
+    Attributes:
+        key: The function, that returns a key for given event processing
+            context.
+    """
+
+    Item = Tuple[str, Context]
+
+    key: Callable[[Context], Optional[Hashable]]
+
+    _lanes: Dict[Hashable, Deque[Item]]
+    _tasks: Set[asyncio.Task]
+
+    def __init__(self, key: Callable[[Context], Optional[Hashable]]):
+        super().__init__()
+        self.key = key
+
+        self._lanes = {}
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        """Returns number of active lanes."""
+        return len(self._lanes)
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        key = self.key(ctx)
+
+        if key is None:
+            self._spawn(self.client.process_event(event, ctx))
+            return
+
+        lane = self._lanes.get(key)
+        if lane is None:
+            self._lanes[key] = lane = collections.deque()
+            self._spawn(self._drain(key, lane))
+        #
+        lane.append((event, ctx))
+
+    async def close(self) -> None:  # noqa: D102
+        tasks, self._tasks = self._tasks, set()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes.clear()
+
+    def _spawn(self, coro) -> None:
+        """Runs given coroutine in a tracked task."""
+        task = self.client.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, key: Hashable, lane: Deque[Item]) -> None:
+        """Processes lane's events until the lane is empty."""
+        try:
+            while lane:
+                event, ctx = lane.popleft()
+                await self.client.process_event(event, ctx)
+        finally:
+            # There is no context switch between the last check and removal, so
+            # no event will be lost.
+            if self._lanes.get(key) is lane:
+                del self._lanes[key]
+
+
+class CoalescingDispatcher(Dispatcher):
+    """Dispatcher, that coalesces bursts of events for another dispatcher.
+
+    Events of configured types with the same key, dispatched within the time
+    window, are merged into a single one. The window starts on the first event
+    and the merged event is passed to the underlying dispatcher when the window
+    ends. All of the other events are passed to the underlying dispatcher
+    immediately.
+
+    Events without a key (``None`` value) are not coalesced.
+
+    .. seealso::
+        :func:`merge_latest` and :func:`merge_before_after` helpers.
+
+    Args:
+        dispatcher: Dispatcher to pass events to.
+        keys: Event types to coalesce. Key is an event type, value is a
+            function, that returns a key for given event processing context.
+        window: Time window in seconds.
+        merge: A function, that merges a pending event processing context with
+            a new one, or such functions by event type. By default, and for
+            event types without a merge function, only the latest event is
+            kept.
+
+    Attributes:
+        dispatcher: Dispatcher to pass events to.
+        keys: Event types to coalesce, with key functions for each one.
+        window: Time window in seconds.
+        merge: The function, that merges a pending event processing context with
+            a new one, or such functions by event type.
+        coalesced: Number of events, merged into another one.
+    """
+
+    Item = Tuple[str, Context]
+    PendingKey = Tuple[EventType, Hashable]
+    MergeFunction = Callable[[Context, Context], Context]
+
+    dispatcher: Dispatcher
+    keys: Dict[EventType, Callable[[Context], Optional[Hashable]]]
+    window: float
+    merge: Union[MergeFunction, Dict[EventType, MergeFunction]]
+    coalesced: int
+
+    _pending: Dict[PendingKey, Item]
+    _timers: Dict[PendingKey, asyncio.Handle]
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        keys: Dict[EventType, Callable[[Context], Optional[Hashable]]],
+        *,
+        window: float = 1.0,
+        merge: Optional[
+            Union[MergeFunction, Dict[EventType, MergeFunction]]
+        ] = None,
+    ):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.keys = keys
+        self.window = window
+        self.merge = merge_latest if merge is None else merge
+        self.coalesced = 0
+
+        self._pending = {}
+        self._timers = {}
+
+    def __len__(self) -> int:
+        """Returns number of events, waiting for the window end."""
+        return len(self._pending)
+
+    def bind(self, client: discord.Client) -> None:  # noqa: D102
+        super().bind(client)
+        self.dispatcher.bind(client)
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        key_fn = self.keys.get(ctx.event)
+        key = None if key_fn is None else key_fn(ctx)
+
+        if key is None:
+            self.dispatcher.dispatch(event, ctx)
+            return
+
+        key = (ctx.event, key)
+        pending = self._pending.get(key)
+
+        if pending is None:
+            self._pending[key] = (event, ctx)
+            self._timers[key] = self.client.loop.call_later(
+                self.window, self._flush, key
+            )
+        else:
+            merge = self.merge
+            if isinstance(merge, dict):
+                merge = merge.get(ctx.event, merge_latest)
+            self._pending[key] = (event, merge(pending[1], ctx))
+            self.coalesced += 1
+
+    async def close(self) -> None:  # noqa: D102
+        for key in list(self._pending):
+            self._timers[key].cancel()
+            self._flush(key)
+        #
+        await self.dispatcher.close()
+
+    def _flush(self, key: PendingKey) -> None:
+        """Passes pending event to the underlying dispatcher."""
+        del self._timers[key]
+        event, ctx = self._pending.pop(key)
+        self.dispatcher.dispatch(event, ctx)
+
+
+class ProcessDispatcher(Dispatcher):
+    """Dispatcher, that processes events in worker processes.
+
+    Every worker process has its own extension manager, with extensions
+    registered by the setup function. Events are partitioned between processes
+    by the key, so events with the same key are always processed by the same
+    process, one by one. Events without a key (``None`` value) are partitioned
+    by round robin.
+
+    Event processing context can't be passed to another process as is, so
+    positional and keyword arguments are converted into plain data by the
+    serializer, and converted back by the deserializer in worker processes. In
+    worker processes, contexts have no client (``None`` value).
+
+    By default, values are converted back into objects with attributes (see
+    :func:`concord.utils.from_plain_data`), so middleware, that only reads
+    attributes, can be used in worker processes. From :mod:`concord.ext.base`,
+    these are :class:`concord.ext.base.EventNormalization`,
+    :class:`concord.ext.base.EventTypeFilter`,
+    :class:`concord.ext.base.PatternFilter`,
+    :class:`concord.ext.base.BotFilter` and :class:`concord.ext.base.Command`.
+    :class:`concord.ext.base.ChannelTypeFilter` can't be used, since it checks
+    types of discord.py objects. Stateful middleware keeps own state in every
+    process.
+
+    The setup function is applied to the client's extension manager as well, so
+    the client knows, what events can be processed. Extension managers of
+    worker processes are closed on dispatcher closing.
+
+    Args:
+        setup: A function, that registers extensions in given extension
+            manager. Should be picklable, i.e. be defined on a module level.
+        processes: Number of worker processes. By default, it is a number of
+            CPUs.
+        key: A function, that returns a key for given event processing context.
+            By default, events are partitioned by guild (see :func:`guild_key`).
+        serializer: A function, that converts a value into something, that can
+            be pickled. By default, :func:`concord.utils.to_plain_data` is used.
+        deserializer: A function, that converts a serialized value back in a
+            worker process. Should be picklable. By default,
+            :func:`concord.utils.from_plain_data` is used with the default
+            serializer, and values are kept as is with a custom one.
+
+    Attributes:
+        setup: The function, that registers extensions in given extension
+            manager.
+        processes: Number of worker processes.
+        key: The function, that returns a key for given event processing
+            context.
+        serializer: The function, that converts a value into something, that
+            can be pickled.
+        deserializer: The function, that converts a serialized value back in a
+            worker process, if present.
+    """
+
+    setup: Callable[[Manager], None]
+    processes: int
+    key: Callable[[Context], Optional[Hashable]]
+    serializer: Callable[[Any], Any]
+    deserializer: Optional[Callable[[Any], Any]]
+
+    _executors: List[ProcessPoolExecutor]
+    _tasks: Set[asyncio.Task]
+    _next_executor: int
+
+    def __init__(
+        self,
+        setup: Callable[[Manager], None],
+        *,
+        processes: Optional[int] = None,
+        key: Optional[Callable[[Context], Optional[Hashable]]] = None,
+        serializer: Optional[Callable[[Any], Any]] = None,
+        deserializer: Optional[Callable[[Any], Any]] = None,
+    ):
+        super().__init__()
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("Processes number should be positive")
+
+        self.setup = setup
+        self.processes = processes
+        self.key = guild_key if key is None else key
+        self.serializer = to_plain_data if serializer is None else serializer
+        if deserializer is None and serializer is None:
+            deserializer = from_plain_data
+        self.deserializer = deserializer
+
+        self._executors = []
+        self._tasks = set()
+        self._next_executor = 0
+
+    def bind(self, client: discord.Client) -> None:  # noqa: D102
+        super().bind(client)
+        self.setup(client.extension_manager)
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        if not self._executors:
+            self._executors = [
+                ProcessPoolExecutor(max_workers=1)
+                for _ in range(self.processes)
+            ]
+
+        key = self.key(ctx)
+        if key is None:
+            index = self._next_executor
+            self._next_executor = (index + 1) % self.processes
+        else:
+            index = hash(key) % self.processes
+
+        # Executor submits the work right now, so events order is kept.
+        future = self.client.loop.run_in_executor(
+            self._executors[index],
+            _process_in_worker,
+            self.setup,
+            self.deserializer,
+            ctx.event.value,
+            self.serializer(list(ctx.args)),
+            self.serializer(ctx.kwargs),
+        )
+        task = self.client.loop.create_task(
+            self.client._run_event(self._wait_for, event, future)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:  # noqa: D102
+        executors, self._executors = self._executors, []
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for executor in executors:
+            try:
+                await self.client.loop.run_in_executor(
+                    executor, _close_in_worker
+                )
+            except Exception:
+                log.exception("Failed to close a worker process")
+            await self.client.loop.run_in_executor(None, executor.shutdown)
+
+    @staticmethod
+    async def _wait_for(future: asyncio.Future) -> None:
+        """Waits for the event processing in a worker process."""
+        await future
+
+
+# Extension manager and event loop of a worker process.
+_worker_manager: Optional[Manager] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _process_in_worker(
+    setup: Callable[[Manager], None],
+    deserializer: Optional[Callable[[Any], Any]],
+    event: Any,
+    args: list,
+    kwargs: dict,
+) -> None:
+    """Processes the event in a worker process of :class:`ProcessDispatcher`."""
+    global _worker_manager, _worker_loop
+
+    if _worker_manager is None:
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+        _worker_manager = Manager()
+        setup(_worker_manager)
+    #
+    if deserializer is not None:
+        args = deserializer(args)
+        kwargs = {k: deserializer(v) for k, v in kwargs.items()}
+    #
+    ctx = Context(None, EventType(event), *args, **kwargs)
+    _worker_loop.run_until_complete(
+        _worker_manager.run(ctx=ctx, next=empty_next_callable)
+    )
+
+
+def _close_in_worker() -> None:
+    """Closes the extension manager of a worker process of
+    :class:`ProcessDispatcher`, so middleware can release its resources."""
+    global _worker_manager, _worker_loop
+
+    if _worker_manager is None:
+        return
+    #
+    manager, loop = _worker_manager, _worker_loop
+    _worker_manager = _worker_loop = None
+    try:
+        loop.run_until_complete(manager.close())
+    finally:
+        loop.close()
+
+
+def merge_latest(previous: Context, current: Context) -> Context:
+    """Merges event processing contexts by keeping the latest one.
+
+    Useful as a merge function for :class:`CoalescingDispatcher`.
+    """
+    return current
+
+
+def merge_before_after(previous: Context, current: Context) -> Context:
+    """Merges event processing contexts of "update" events into a single
+    before / after pair.
+
+    The ``before`` value is taken from the first event, all of the other values
+    are taken from the latest one. The deadline is taken from the latest event
+    as well. Events, that don't end with ``before`` and ``after`` fields (see
+    :data:`concord.constants.EVENT_FIELDS`), are merged by keeping the latest
+    one (see :func:`merge_latest`).
+
+    Useful as a merge function for :class:`CoalescingDispatcher`.
+    """
+    fields = EVENT_FIELDS.get(current.event, ())
+    if fields[-2:] != ("before", "after") or len(current.args) < 2:
+        return merge_latest(previous, current)
+    #
+    ctx = Context(
+        current.client,
+        current.event,
+        *current.args[:-2],
+        previous.args[-2],
+        current.args[-1],
+        **current.kwargs,
+    )
+    ctx.deadline = current.deadline
+    return ctx
+
+
+def author_key(ctx: Context) -> Optional[int]:
+    """Returns an id of the user, the event is caused by.
+
+    Useful as a key for :class:`KeyedDispatcher`.
+    """
+    for arg in ctx.args:
+        if isinstance(arg, discord.Reaction):
+            # Reactions are followed by the reacted user
+            continue
+        if isinstance(arg, discord.Message):
+            return arg.author.id
+        if isinstance(arg, discord.abc.User):
+            return arg.id
+
+        user_id = getattr(arg, "user_id", None)
+        if user_id is not None:
+            return user_id
+    #
+    return None
+
+
+def channel_key(ctx: Context) -> Optional[int]:
+    """Returns an id of the channel, the event is related to.
+
+    Useful as a key for :class:`KeyedDispatcher`.
+    """
+    for arg in ctx.args:
+        if isinstance(arg, discord.Reaction):
+            arg = arg.message
+        if isinstance(arg, discord.Message):
+            return arg.channel.id
+        if isinstance(
+            arg, (discord.abc.GuildChannel, discord.abc.PrivateChannel)
+        ):
+            return arg.id
+
+        channel_id = getattr(arg, "channel_id", None)
+        if channel_id is not None:
+            return channel_id
+    #
+    return None
+
+
+def guild_key(ctx: Context) -> Optional[int]:
+    """Returns an id of the guild, the event is related to.
+
+    Useful as a key for :class:`KeyedDispatcher`.
+    """
+    for arg in ctx.args:
+        if isinstance(arg, discord.Reaction):
+            arg = arg.message
+        if isinstance(arg, discord.Guild):
+            return arg.id
+
+        guild = getattr(arg, "guild", None)
+        if guild is not None:
+            return guild.id
+
+        guild_id = getattr(arg, "guild_id", None)
+        if guild_id is not None:
+            return guild_id
+    #
+    return None
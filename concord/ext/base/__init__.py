@@ -23,5 +23,9 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from concord import __version__
 
+from concord.ext.base.batching import Batching
+from concord.ext.base.cache import ResultCache
+from concord.ext.base.dedup import Deduplication, event_identity
 from concord.ext.base.event import EventNormalization
 from concord.ext.base.filters import *  # it's okay, we control it
+from concord.ext.base.ratelimit import RateLimit
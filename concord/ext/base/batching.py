@@ -0,0 +1,149 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Set, Union
+
+from concord.context import Context
+from concord.middleware import Middleware, MiddlewareResult
+
+
+log = logging.getLogger(__name__)
+
+
+class Batching(Middleware):
+    """Middleware for processing events in batches.
+
+    It is a last-to-call middleware. Contexts of runs are collected, and the
+    batch handler is called once with a list of them, when the batch is full or
+    when given delay is passed since the first context in the batch. The run,
+    that fills the batch, waits for the batch handler, the others return
+    immediately.
+
+    Collected contexts are flushed on closing as well (see :meth:`close`).
+    Exceptions of batches, that are not processed by a run, are logged.
+
+    Args:
+        handler: Function, that processes a list of contexts. Can be a
+            coroutine, or a plain function.
+        size: Maximum number of contexts in a batch.
+        delay: Maximum time in seconds, a context can wait in a batch.
+
+    Raises:
+        ValueError: If size or delay is not positive.
+
+    Attributes:
+        handler: Function, that processes a list of contexts.
+        size: Maximum number of contexts in a batch.
+        delay: Maximum time in seconds, a context can wait in a batch.
+        batches: Number of processed batches.
+        _pending: Contexts of the current batch.
+        _timer: Timer handle of the current batch flushing.
+        _tasks: Running tasks of batches, flushed by timer.
+    """
+
+    handler: Callable[[List[Context]], Any]
+    size: int
+    delay: float
+    batches: int
+
+    _pending: List[Context]
+    _timer: Optional[asyncio.Handle]
+    _tasks: Set[asyncio.Future]
+
+    def __init__(
+        self,
+        handler: Callable[[List[Context]], Any],
+        *,
+        size: int = 100,
+        delay: float = 1.0,
+    ):
+        super().__init__()
+
+        if size <= 0:
+            raise ValueError("Size should be positive")
+        if delay <= 0:
+            raise ValueError("Delay should be positive")
+        self.handler = handler
+        self.size = size
+        self.delay = delay
+        self.batches = 0
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        self._pending.append(ctx)
+
+        if len(self._pending) >= self.size:
+            await self._process(self._take())
+        elif self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(
+                self.delay, self._flush_by_timer
+            )
+
+    async def close(self) -> None:
+        """Processes collected contexts and waits for running batches.
+
+        Exceptions are logged only, to not break closing of other middleware.
+        """
+        if self._pending:
+            await self._process_logged(self._take())
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _take(self) -> List[Context]:
+        """Takes the current batch and cancels its flushing timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        #
+        batch = self._pending
+        self._pending = []
+        return batch
+
+    def _flush_by_timer(self) -> None:
+        self._timer = None
+        task = asyncio.ensure_future(self._process_logged(self._take()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: List[Context]) -> None:
+        self.batches += 1
+        result = self.handler(batch)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def _process_logged(self, batch: List[Context]) -> None:
+        try:
+            await self._process(batch)
+        except Exception:
+            log.exception(
+                f"Processing of a batch of {len(batch)} contexts has failed"
+            )
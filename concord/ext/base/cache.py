@@ -0,0 +1,150 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from concord.context import Context
+from concord.middleware import Middleware, MiddlewareResult
+
+
+class ResultCache(Middleware):
+    """Middleware for caching results of the next middleware.
+
+    Results are cached by a key, computed from the context and keyword
+    parameters. Only successful results are cached. Least recently used
+    results are evicted, if the cache is full, and results are expired after
+    given time to live, if it is set.
+
+    Only one computation is running for the same key at the same time. Other
+    runs with this key wait for it and get the same result (or exception).
+    These runs are counted as hits.
+
+    Args:
+        key: Function, that returns a key for given context and keyword
+            parameters. If it returns ``None``, the result will not be cached.
+        size: Maximum number of cached results.
+        ttl: Time to live of cached results, in seconds.
+
+    Raises:
+        ValueError: If size is not positive.
+
+    Attributes:
+        key: Function, that returns a key for given context and keyword
+            parameters.
+        size: Maximum number of cached results.
+        ttl: Time to live of cached results, in seconds.
+        hits: Number of runs, when a result was taken from the cache.
+        misses: Number of runs, when the next middleware was invoked.
+        _cache: Cached results. Key is a cache key, value is a tuple of
+            expiration time (or ``None``) and the result.
+        _pending: Futures of running computations by cache key.
+    """
+
+    key: Callable[[Context, Dict[str, Any]], Optional[Hashable]]
+    size: int
+    ttl: Optional[float]
+    hits: int
+    misses: int
+
+    _cache: "OrderedDict[Hashable, Tuple[Optional[float], Any]]"
+    _pending: Dict[Hashable, asyncio.Future]
+
+    def __init__(
+        self,
+        key: Callable[[Context, Dict[str, Any]], Optional[Hashable]],
+        *,
+        size: int = 128,
+        ttl: Optional[float] = None,
+    ):
+        super().__init__()
+
+        if size <= 0:
+            raise ValueError("Size should be positive")
+        self.key = key
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        """Drops all of the cached results."""
+        self._cache.clear()
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        key = self.key(ctx, kwargs)
+        if key is None:
+            return await next(*args, ctx=ctx, **kwargs)
+
+        loop = asyncio.get_event_loop()
+        entry = self._cache.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires is None or expires > loop.time():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._cache[key]
+
+        future = self._pending.get(key)
+        if future is not None:
+            self.hits += 1
+            # Cancelling of a waiting run should not affect the computation
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = self._pending[key] = loop.create_future()
+
+        try:
+            result = await next(*args, ctx=ctx, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Nobody may wait for it, mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+        #
+        future.set_result(result)
+        if self.is_successful_result(result):
+            self._store(key, result, loop.time())
+        return result
+
+    def _store(self, key: Hashable, result: Any, now: float) -> None:
+        expires = None if self.ttl is None else now + self.ttl
+        self._cache[key] = (expires, result)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
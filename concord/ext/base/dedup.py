@@ -0,0 +1,191 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.middleware import Middleware, MiddlewareResult
+
+
+def _message_identity(message) -> Hashable:
+    return message.id
+
+
+def _message_edit_identity(before, after) -> Hashable:
+    return after.id, after.edited_at
+
+
+def _reaction_identity(reaction, user) -> Hashable:
+    return reaction.message.id, str(reaction.emoji), user.id
+
+
+def _raw_reaction_identity(payload) -> Hashable:
+    return payload.message_id, payload.user_id, str(payload.emoji)
+
+
+def _raw_message_identity(payload) -> Hashable:
+    return payload.message_id
+
+
+EVENT_IDENTITIES: Dict[EventType, Callable[..., Hashable]] = {
+    EventType.MESSAGE: _message_identity,
+    EventType.MESSAGE_DELETE: _message_identity,
+    EventType.MESSAGE_EDIT: _message_edit_identity,
+    EventType.REACTION_ADD: _reaction_identity,
+    EventType.REACTION_REMOVE: _reaction_identity,
+    EventType.RAW_MESSAGE_DELETE: _raw_message_identity,
+    EventType.RAW_REACTION_ADD: _raw_reaction_identity,
+    EventType.RAW_REACTION_REMOVE: _raw_reaction_identity,
+}
+
+#: Event types, that cancel each other. Once an event is processed, identity of
+#: the opposite event with the same key is forgotten, so a reaction can be
+#: added again after removing.
+OPPOSITE_EVENTS: Dict[EventType, EventType] = {
+    EventType.REACTION_ADD: EventType.REACTION_REMOVE,
+    EventType.REACTION_REMOVE: EventType.REACTION_ADD,
+    EventType.RAW_REACTION_ADD: EventType.RAW_REACTION_REMOVE,
+    EventType.RAW_REACTION_REMOVE: EventType.RAW_REACTION_ADD,
+}
+
+
+def event_identity(ctx: Context) -> Optional[Hashable]:
+    """Returns an identity of the event, or ``None``, if the event can't be
+    identified.
+
+    Messages are identified by an id (and time of editing for message edits),
+    reactions are identified by a message, emoji and user. Events with other
+    types are not identified (see :data:`EVENT_IDENTITIES`).
+    """
+    identity = EVENT_IDENTITIES.get(ctx.event)
+    if identity is None:
+        return None
+    #
+    try:
+        return ctx.event, identity(*ctx.args)
+    except (AttributeError, TypeError):
+        return None
+
+
+class Deduplication(Middleware):
+    """Duplicated events suppression.
+
+    Identities of recently processed events are remembered for given time
+    window, and repeated events are not passed to the next middleware. It is
+    useful for events, that are received again after resuming a session.
+
+    Number of remembered identities is limited, the oldest ones are forgotten
+    first. Identities of :data:`OPPOSITE_EVENTS` are forgotten on processing of
+    the opposite event (identities should be in form of :func:`event_identity`
+    for that).
+
+    Args:
+        identity: Function, that returns an identity of the event. If it
+            returns ``None``, the event is not deduplicated. By default,
+            :func:`event_identity` is used.
+        window: Time window in seconds, during which events are remembered.
+        size: Maximum number of remembered events.
+
+    Raises:
+        ValueError: If window or size is not positive.
+
+    Attributes:
+        identity: Function, that returns an identity of the event.
+        window: Time window in seconds, during which events are remembered.
+        size: Maximum number of remembered events.
+        hits: Number of suppressed events.
+        _seen: Time of processing by event identity. Events are in order of
+            processing.
+    """
+
+    identity: Callable[[Context], Optional[Hashable]]
+    window: float
+    size: int
+    hits: int
+
+    _seen: "OrderedDict[Hashable, float]"
+
+    def __init__(
+        self,
+        identity: Callable[[Context], Optional[Hashable]] = event_identity,
+        *,
+        window: float = 60.0,
+        size: int = 10000,
+    ):
+        super().__init__()
+
+        if window <= 0:
+            raise ValueError("Window should be positive")
+        if size <= 0:
+            raise ValueError("Size should be positive")
+        self.identity = identity
+        self.window = window
+        self.size = size
+        self.hits = 0
+        self._seen = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        identity = self.identity(ctx)
+        if identity is None:
+            return await next(*args, ctx=ctx, **kwargs)
+
+        now = asyncio.get_event_loop().time()
+        self._expire(now)
+
+        if identity in self._seen:
+            self.hits += 1
+            return MiddlewareResult.IGNORE
+
+        self._seen[identity] = now
+        if len(self._seen) > self.size:
+            self._seen.popitem(last=False)
+        self._forget_opposite(identity)
+        return await next(*args, ctx=ctx, **kwargs)
+
+    def _forget_opposite(self, identity: Hashable) -> None:
+        """Forgets the opposite event of the event with given identity."""
+        if not isinstance(identity, tuple) or len(identity) != 2:
+            return
+        #
+        opposite = OPPOSITE_EVENTS.get(identity[0])
+        if opposite is not None:
+            self._seen.pop((opposite, identity[1]), None)
+
+    def _expire(self, now: float) -> None:
+        """Forgets events, that are out of the time window."""
+        seen = self._seen
+        expired = now - self.window
+
+        while seen:
+            identity, time = next(iter(seen.items()))
+            if time > expired:
+                break
+            del seen[identity]
@@ -23,7 +23,7 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from typing import Any, Callable, Dict, Tuple, Union
 
-from concord.constants import EventType
+from concord.constants import EVENT_FIELDS, EventType
 from concord.context import Context
 from concord.middleware import Middleware, MiddlewareResult, MiddlewareState
 
@@ -47,72 +47,25 @@ class EventNormalization(Middleware):
     A middleware for parsing positional event' fields into keyword for known
     events. Positional fields will be left as is.
 
+    Named fields are taken from the context (see
+    :attr:`concord.context.Context.fields`), unless :attr:`EVENT_FIELDS` is
+    overridden.
+
+    Built-in filters read named fields from the context, so they don't need
+    the normalization. It is kept for handlers, that read fields from keyword
+    arguments. Prefer :attr:`concord.context.Context.fields` in new code, it
+    saves a copy of fields per event.
+
     Attributes:
-        EVENT_FIELDS: Fields list each event has.
+        EVENT_FIELDS: Fields list each event has (see
+            :data:`concord.constants.EVENT_FIELDS`).
     """
 
-    EVENT_FIELDS: Dict[EventType, Tuple[str, ...]] = {
-        EventType.CONNECT: tuple(),
-        EventType.ERROR: tuple(),
-        EventType.GROUP_JOIN: ("channel", "user"),
-        EventType.GROUP_REMOVE: ("channel", "user"),
-        EventType.GUILD_AVAILABLE: ("guild",),
-        EventType.GUILD_CHANNEL_CREATE: ("channel",),
-        EventType.GUILD_CHANNEL_DELETE: ("channel",),
-        EventType.GUILD_CHANNEL_PINS_UPDATE: ("channel", "last_pin"),
-        EventType.GUILD_CHANNEL_UPDATE: ("before", "after"),
-        EventType.GUILD_EMOJIS_UPDATE: ("guild", "before", "after"),
-        EventType.GUILD_JOIN: ("guild",),
-        EventType.GUILD_REMOVE: ("guild",),
-        EventType.GUILD_ROLE_CREATE: ("role",),
-        EventType.GUILD_ROLE_DELETE: ("role",),
-        EventType.GUILD_ROLE_UPDATE: ("before", "after"),
-        EventType.GUILD_UNAVAILABLE: ("guild",),
-        EventType.GUILD_UPDATE: ("before", "after"),
-        EventType.MEMBER_BAN: ("guild", "user"),
-        EventType.MEMBER_JOIN: ("member",),
-        EventType.MEMBER_REMOVE: ("member",),
-        EventType.MEMBER_UNBAN: ("guild", "user"),
-        EventType.MEMBER_UPDATE: ("before", "after"),
-        EventType.MESSAGE: ("message",),
-        EventType.MESSAGE_DELETE: ("message",),
-        EventType.MESSAGE_EDIT: ("before", "after"),
-        EventType.PRIVATE_CHANNEL_CREATE: ("channel",),
-        EventType.PRIVATE_CHANNEL_DELETE: ("channel",),
-        EventType.PRIVATE_CHANNEL_PINS_UPDATE: ("channel", "last_pin"),
-        EventType.PRIVATE_CHANNEL_UPDATE: ("before", "after"),
-        EventType.RAW_BULK_MESSAGE_DELETE: ("payload",),
-        EventType.RAW_MESSAGE_DELETE: ("payload",),
-        EventType.RAW_MESSAGE_EDIT: ("payload",),
-        EventType.RAW_REACTION_ADD: ("payload",),
-        EventType.RAW_REACTION_CLEAR: ("payload",),
-        EventType.RAW_REACTION_REMOVE: ("payload",),
-        EventType.REACTION_ADD: ("reaction", "user"),
-        EventType.REACTION_CLEAR: ("message", "reactions"),
-        EventType.REACTION_REMOVE: ("reaction, user",),
-        EventType.READY: tuple(),
-        EventType.RELATIONSHIP_ADD: ("relationship",),
-        EventType.RELATIONSHIP_REMOVE: ("relationship",),
-        EventType.RELATIONSHIP_UPDATE: ("before", "after"),
-        EventType.RESUMED: tuple(),
-        EventType.SHARD_READY: ("shard_id",),
-        EventType.SOCKET_RAW_RECEIVE: ("msg",),
-        EventType.SOCKET_RAW_SEND: ("payload",),
-        EventType.SOCKET_RESPONSE: ("playload",),
-        EventType.TYPING: ("channel", "user", "timestamp"),
-        EventType.VOICE_STATE_UPDATE: ("member", "before", "after"),
-        EventType.WEBHOOKS_UPDATE: ("channel",),
-    }
+    EVENT_FIELDS: Dict[EventType, Tuple[str, ...]] = EVENT_FIELDS
 
     @staticmethod
     def _get_state(ctx: Context) -> EventNormalizationContextState:
-        state = MiddlewareState.get_state(ctx, EventNormalizationContextState)
-
-        if state is None:
-            state = EventNormalizationContextState()
-            MiddlewareState.set_state(ctx, state)
-        #
-        return state
+        return EventNormalizationContextState.from_context(ctx)
 
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
@@ -124,8 +77,10 @@ class EventNormalization(Middleware):
         if state.is_processed:
             return await next(*args, ctx=ctx, **kwargs)
 
-        for i, parameter in enumerate(self.EVENT_FIELDS[ctx.event]):
-            ctx.kwargs[parameter] = ctx.args[i]
+        if self.EVENT_FIELDS is EVENT_FIELDS:
+            ctx.kwargs.update(ctx.fields)
+        else:
+            ctx.kwargs.update(zip(self.EVENT_FIELDS[ctx.event], ctx.args))
 
         state.is_processed = True
         return await next(*args, ctx=ctx, **kwargs)
@@ -79,20 +79,14 @@ class Command(Middleware):
 
     @staticmethod
     def _get_state(ctx: Context) -> CommandContextState:
-        state = MiddlewareState.get_state(ctx, CommandContextState)
-
-        if state is None:
-            state = CommandContextState()
-            MiddlewareState.set_state(ctx, state)
-        #
-        return state
+        return CommandContextState.from_context(ctx)
 
     # TODO: What about arabic text?
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:  # noqa: D102
         state = self._get_state(ctx)
-        message = ctx.kwargs["message"]
+        message = ctx.fields["message"]
         name_pattern = rf"{self.name}" if self.prefix else rf"{self.name}\b"
 
         # We should restore last position after processing.
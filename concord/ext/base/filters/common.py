@@ -22,16 +22,16 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import re
-from typing import Any, Callable, Union
+from typing import FrozenSet
 
 import discord
 
 from concord.constants import EventType
 from concord.context import Context
-from concord.middleware import Middleware, MiddlewareResult
+from concord.middleware import MiddlewarePredicate
 
 
-class EventTypeFilter(Middleware):
+class EventTypeFilter(MiddlewarePredicate):
     """Event type filter.
 
     Args:
@@ -47,15 +47,17 @@ class EventTypeFilter(Middleware):
         super().__init__()
         self.event = event
 
-    async def run(
-        self, *args, ctx: Context, next: Callable, **kwargs
-    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
-        if ctx.event == self.event:
-            return await next(*args, ctx=ctx, **kwargs)
-        return MiddlewareResult.IGNORE
+    @property
+    def event_types(self) -> FrozenSet[EventType]:  # noqa: D102
+        return frozenset((self.event,))
 
+    def check(
+        self, args: tuple, ctx: Context, kwargs: dict
+    ) -> bool:  # noqa: D102
+        return ctx.event == self.event
 
-class PatternFilter(Middleware):
+
+class PatternFilter(MiddlewarePredicate):
     """Message context filter.
 
     The message should match the given regex pattern to invoke the next
@@ -78,19 +80,19 @@ class PatternFilter(Middleware):
         super().__init__()
         self.pattern = pattern
 
-    async def run(
-        self, *args, ctx: Context, next: Callable, **kwargs
-    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
-        result = re.search(self.pattern, ctx.kwargs["message"].content)
+    def check(
+        self, args: tuple, ctx: Context, kwargs: dict
+    ) -> bool:  # noqa: D102
+        result = re.search(self.pattern, ctx.fields["message"].content)
 
         if result:
             kwargs.update(result.groupdict())
-            return await next(*args, ctx=ctx, **kwargs)
+            return True
         #
-        return MiddlewareResult.IGNORE
+        return False
 
 
-class BotFilter(Middleware):
+class BotFilter(MiddlewarePredicate):
     """Message context filter.
 
     The message should be authored by or not authored by a real user to invoke
@@ -109,15 +111,13 @@ class BotFilter(Middleware):
         super().__init__()
         self.authored_by_bot = authored_by_bot
 
-    async def run(
-        self, *args, ctx: Context, next: Callable, **kwargs
-    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
-        if not self.authored_by_bot ^ ctx.kwargs["message"].author.bot:
-            return await next(*args, ctx=ctx, **kwargs)
-        return MiddlewareResult.IGNORE
+    def check(
+        self, args: tuple, ctx: Context, kwargs: dict
+    ) -> bool:  # noqa: D102
+        return not self.authored_by_bot ^ ctx.fields["message"].author.bot
 
 
-class ChannelTypeFilter(Middleware):
+class ChannelTypeFilter(MiddlewarePredicate):
     """Message context filter.
 
     The message should be sent in the given channel types to invoke the next
@@ -165,19 +165,16 @@ class ChannelTypeFilter(Middleware):
         self.dm = private or dm
         self.group = private or group
 
-    async def run(
-        self, *args, ctx: Context, next: Callable, **kwargs
-    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
-        channel = ctx.kwargs["message"].channel
+    def check(
+        self, args: tuple, ctx: Context, kwargs: dict
+    ) -> bool:  # noqa: D102
+        channel = ctx.fields["message"].channel
 
         # fmt: off
-        if (
+        return (
             self.text and isinstance(channel, discord.TextChannel)
             or self.voice and isinstance(channel, discord.VoiceChannel)
             or self.dm and isinstance(channel, discord.DMChannel)
             or self.group and isinstance(channel, discord.GroupChannel)
-        ):
-            return await next(*args, ctx=ctx, **kwargs)
+        )
         # fmt: on
-
-        return MiddlewareResult.IGNORE
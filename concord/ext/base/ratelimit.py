@@ -0,0 +1,147 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple, Union
+
+from concord.context import Context
+from concord.middleware import Middleware, MiddlewareResult, as_middleware
+
+
+class RateLimit(Middleware):
+    """Token bucket rate limiter.
+
+    Every key (user, channel, guild, etc.) has own bucket of tokens, that is
+    refilled with given rate up to given burst size. Every run takes a token
+    from the bucket, and if there is no tokens, the next middleware is not
+    invoked.
+
+    Buckets, that are refilled to full, are the same as new ones, and they are
+    dropped on next runs. Memory is bounded by number of keys, that have been
+    seen during the refill time.
+
+    Key functions from :mod:`concord.dispatcher` can be used as well (see
+    :func:`concord.dispatcher.author_key`,
+    :func:`concord.dispatcher.channel_key` and
+    :func:`concord.dispatcher.guild_key`).
+
+    Args:
+        key: Function, that returns a key of the bucket for given context. If
+            it returns ``None``, the run is not limited.
+        rate: Number of tokens, added to a bucket per second.
+        burst: Maximum number of tokens in a bucket.
+        on_limit: Middleware (or a function) to run instead of the next
+            middleware, if the run is limited. If not set, unsuccessful result
+            is returned.
+
+    Raises:
+        ValueError: If rate or burst are not positive.
+
+    Attributes:
+        key: Function, that returns a key of the bucket for given context.
+        rate: Number of tokens, added to a bucket per second.
+        burst: Maximum number of tokens in a bucket.
+        on_limit: Middleware to run, if the run is limited.
+        limited: Number of limited runs.
+        _buckets: Buckets by key. Value is a tuple of number of tokens and time
+            of the last update. Least recently updated buckets are first.
+    """
+
+    key: Callable[[Context], Optional[Hashable]]
+    rate: float
+    burst: int
+    on_limit: Optional[Middleware]
+    limited: int
+
+    _buckets: "OrderedDict[Hashable, Tuple[float, float]]"
+
+    def __init__(
+        self,
+        key: Callable[[Context], Optional[Hashable]],
+        *,
+        rate: float,
+        burst: int = 1,
+        on_limit: Optional[Union[Middleware, Callable]] = None,
+    ):
+        super().__init__()
+
+        if rate <= 0:
+            raise ValueError("Rate should be positive")
+        if burst <= 0:
+            raise ValueError("Burst should be positive")
+        if on_limit is not None and not isinstance(on_limit, Middleware):
+            on_limit = as_middleware(on_limit)
+
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self.on_limit = on_limit
+        self.limited = 0
+        self._buckets = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        key = self.key(ctx)
+        if key is None:
+            return await next(*args, ctx=ctx, **kwargs)
+
+        if self._acquire(key, asyncio.get_event_loop().time()):
+            return await next(*args, ctx=ctx, **kwargs)
+        #
+        self.limited += 1
+        if self.on_limit is None:
+            return MiddlewareResult.IGNORE
+        return await self.on_limit.run(*args, ctx=ctx, next=next, **kwargs)
+
+    def _acquire(self, key: Hashable, now: float) -> bool:
+        """Takes a token from the key's bucket, if possible."""
+        self._expire(now)
+
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = self.burst
+        else:
+            tokens, updated = bucket
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+        acquired = tokens >= 1
+        if acquired:
+            tokens -= 1
+        # Re-inserting keeps buckets ordered by update time
+        self._buckets[key] = (tokens, now)
+        return acquired
+
+    def _expire(self, now: float) -> None:
+        """Drops least recently updated buckets, that are refilled to full."""
+        buckets = self._buckets
+
+        while buckets:
+            key, (tokens, updated) = next(iter(buckets.items()))
+            if tokens + (now - updated) * self.rate < self.burst:
+                break
+            del buckets[key]
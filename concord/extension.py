@@ -22,17 +22,31 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import logging
-from typing import Dict, Sequence, Type, Optional, Callable, Union, Any
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
 
+from concord.constants import EventType, Priority
 from concord.context import Context
 from concord.exceptions import ExtensionManagerError
 from concord.middleware import (
     Middleware,
     MiddlewareChain,
+    MiddlewareSequence,
     chain_of,
+    collection_of,
     sequence_of,
     MiddlewareResult,
 )
+from concord.optimizer import optimize_with_stats
+from concord.profiler import ProfiledMiddleware, format_report, profile
 
 
 log = logging.getLogger(__name__)
@@ -85,6 +99,17 @@ class Extension:
         """
         return []
 
+    @property
+    def event_priorities(self) -> Dict[EventType, Priority]:
+        """Event processing priorities, requested by this extension.
+
+        It overrides default priorities of
+        :class:`concord.dispatcher.PriorityDispatcher`. If different extensions
+        request different priorities for the same event type, the highest one
+        will be used.
+        """
+        return {}
+
     def on_register(self, manager: "Manager"):
         """Listener invoked on registering extension in a manager.
 
@@ -112,25 +137,75 @@ class Extension:
 class Manager(Middleware):
     """Extension manager. It is a middleware itself.
 
+    Events are processed by a dispatch plan, built for each event type
+    separately (see :meth:`get_dispatch_plan`). Extension middleware, that can't
+    process an event type, will be skipped without running.
+
+    Some events can be dispatched by the client in batches as well (see
+    :attr:`BATCHED_EVENTS`). If batched events suppression is enabled, single
+    events are not passed to extensions, that process batches of them.
+
+    Dispatch plans can be profiled (see :meth:`enable_profiling`). Profiling
+    wraps every middleware of newly built plans, there is no overhead, when it
+    is disabled.
+
+    Args:
+        suppress_batched_events: Enable batched events suppression.
+        sequence_class: Sequence class to run extension middleware with. Use
+            :class:`concord.middleware.MiddlewareConcurrentSequence` to run
+            extension middleware concurrently.
+
     Attributes:
+        BATCHED_EVENTS: Event types, that can be dispatched in batches. Key is
+            a single event type, value is a batch event type.
+        suppress_batched_events: Is batched events suppression enabled.
+        sequence_class: Sequence class to run extension middleware with.
+        profiling: Is profiling enabled.
+        profiles: Profiled dispatch plans. Key is an event type, value is a
+            profiled dispatch plan for this event type.
         _extensions: List of registered extensions. Key is an extension class
             (subclass of :class:`Extension`), value is extension instance.
         _client_middleware_cache: Cached list of client middleware.
         _extension_middleware_cache: Cached list of extension middleware.
         _root_middleware_cache: Cached root middleware.
+        _event_priorities_cache: Cached event priorities.
+        _dispatch_plan_cache: Cached dispatch plans. Key is an event type, value
+            is a dispatch plan for this event type.
     """
 
+    BATCHED_EVENTS: Dict[EventType, EventType] = {
+        EventType.GUILD_AVAILABLE: EventType.GUILD_AVAILABLE_BATCH
+    }
+
+    suppress_batched_events: bool
+    sequence_class: Type[MiddlewareSequence]
+    profiling: bool
+    profiles: Dict[EventType, ProfiledMiddleware]
+
     _extensions: Dict[Type[Extension], Extension]
     _client_middleware_cache: Optional[Sequence[Middleware]]
     _extension_middleware_cache: Optional[Sequence[Middleware]]
     _root_middleware_cache: Optional[Middleware]
-
-    def __init__(self):
+    _event_priorities_cache: Optional[Dict[EventType, Priority]]
+    _dispatch_plan_cache: Dict[EventType, Optional[Middleware]]
+
+    def __init__(
+        self,
+        *,
+        suppress_batched_events: bool = False,
+        sequence_class: Type[MiddlewareSequence] = MiddlewareSequence,
+    ):
         super().__init__()
+        self.suppress_batched_events = suppress_batched_events
+        self.sequence_class = sequence_class
+        self.profiling = False
+        self.profiles = {}
         self._extensions = {}
         self._client_middleware_cache = None
         self._extension_middleware_cache = None
         self._root_middleware_cache = None
+        self._event_priorities_cache = None
+        self._dispatch_plan_cache = {}
 
     @property
     def client_middleware(self) -> Sequence[Middleware]:
@@ -160,12 +235,150 @@ class Manager(Middleware):
     def root_middleware(self) -> MiddlewareChain:
         """Root middleware, a built chain of client and extension middleware."""
         if self._root_middleware_cache is None:
-            chain = chain_of([sequence_of(self.extension_middleware)])
+            chain = chain_of(
+                [collection_of(self.sequence_class, self.extension_middleware)]
+            )
             for mw in self.client_middleware:
                 chain.add_middleware(mw)
             self._root_middleware_cache = chain
         return self._root_middleware_cache
 
+    @property
+    def event_priorities(self) -> Dict[EventType, Priority]:
+        """Event processing priorities, requested by extensions."""
+        if self._event_priorities_cache is None:
+            priorities = {}
+            for extension in self._extensions.values():
+                for event, priority in extension.event_priorities.items():
+                    priorities[event] = max(
+                        priority, priorities.get(event, priority)
+                    )
+            self._event_priorities_cache = priorities
+        return self._event_priorities_cache
+
+    @property
+    def event_types(self) -> Optional[FrozenSet[EventType]]:
+        """Event types, that can be processed by registered extensions."""
+        return sequence_of(self.extension_middleware).event_types
+
+    def can_process(self, event: EventType) -> bool:
+        """Returns ``True``, if any of registered extensions can process given
+        event type.
+
+        Unlike :attr:`event_types`, it uses cached dispatch plans, and it is
+        cheap enough to be called on every event.
+        """
+        return self.get_dispatch_plan(event) is not None
+
+    def get_dispatch_plan(self, event: EventType) -> Optional[Middleware]:
+        """Returns a middleware to run on given event type.
+
+        It is built like the root middleware, but extension middleware, that
+        can't process given event type, are excluded from it. Built middleware
+        tree is optimized as well (see :func:`concord.optimizer.optimize`).
+
+        .. seealso::
+            :attr:`concord.middleware.Middleware.event_types`.
+
+        Args:
+            event: Event type to get the dispatch plan for.
+
+        Returns:
+            Middleware to run, or ``None``, if no extension middleware can
+            process given event type.
+        """
+        try:
+            return self._dispatch_plan_cache[event]
+        except KeyError:
+            pass
+
+        batch_event = self.BATCHED_EVENTS.get(event)
+        if self.suppress_batched_events and batch_event is not None:
+            extension_middleware = [
+                mw
+                for extension in self._extensions.values()
+                if not self._is_processing_batches(extension, batch_event)
+                for mw in extension.extension_middleware
+                if mw.can_process(event)
+            ]
+        else:
+            extension_middleware = [
+                mw for mw in self.extension_middleware if mw.can_process(event)
+            ]
+
+        if extension_middleware:
+            plan = chain_of(
+                [collection_of(self.sequence_class, extension_middleware)]
+            )
+            for mw in self.client_middleware:
+                plan.add_middleware(mw)
+            plan, before, after = optimize_with_stats(plan)
+            log.debug(
+                f"Dispatch plan for {event} event type has been built "
+                f"(depth {before.depth} -> {after.depth}, "
+                f"nodes {before.nodes} -> {after.nodes})"
+            )
+            if self.profiling:
+                plan = self.profiles[event] = profile(plan)
+        else:
+            plan = None
+
+        self._dispatch_plan_cache[event] = plan
+        return plan
+
+    @staticmethod
+    def _is_processing_batches(
+        extension: Extension, batch_event: EventType
+    ) -> bool:
+        """Returns ``True``, if the extension explicitly processes given batch
+        event type."""
+        for mw in extension.extension_middleware:
+            event_types = mw.event_types
+            if event_types is not None and batch_event in event_types:
+                return True
+        #
+        return False
+
+    def _invalidate_cache(self):
+        """Drops all of the cached middleware lists and plans."""
+        self._client_middleware_cache = None
+        self._extension_middleware_cache = None
+        self._root_middleware_cache = None
+        self._event_priorities_cache = None
+        self._dispatch_plan_cache = {}
+
+    def enable_profiling(self):
+        """Enables profiling of dispatch plans.
+
+        Previously collected profiles are dropped.
+
+        .. seealso::
+            :func:`concord.profiler.profile`.
+        """
+        self.profiling = True
+        self.profiles = {}
+        self._dispatch_plan_cache = {}
+
+    def disable_profiling(self):
+        """Disables profiling of dispatch plans.
+
+        Collected profiles are left until profiling is enabled again.
+        """
+        self.profiling = False
+        self._dispatch_plan_cache = {}
+
+    def format_profiles(self) -> str:
+        """Formats a tree-shaped report of collected profiles.
+
+        .. seealso::
+            :func:`concord.profiler.format_report`.
+        """
+        lines = []
+        for event, profiled in self.profiles.items():
+            lines.append(f"{event.name}:")
+            lines.append(format_report(profiled, indent=1))
+        return "\n".join(lines)
+
     def is_extension_registered(self, extension: Type[Extension]) -> bool:
         """Checks is extension registered in the manager.
 
@@ -199,9 +412,7 @@ class Manager(Middleware):
         instance = extension()
         instance.on_register(self)
         self._extensions[extension] = instance
-        self._client_middleware_cache = None
-        self._extension_middleware_cache = None
-        self._root_middleware_cache = None
+        self._invalidate_cache()
 
         log.info(
             f'Extension "{extension.NAME} "'
@@ -228,9 +439,7 @@ class Manager(Middleware):
             raise ExtensionManagerError("Not registered")
 
         instance = self._extensions.pop(extension)
-        self._client_middleware_cache = None
-        self._extension_middleware_cache = None
-        self._root_middleware_cache = None
+        self._invalidate_cache()
         instance.on_unregister(self)
 
         log.info(
@@ -238,9 +447,14 @@ class Manager(Middleware):
             f"(version {extension.VERSION}) has been unregistered"
         )
 
+    async def close(self) -> None:
+        """Closes client and extension middleware of registered extensions."""
+        await self.root_middleware.close()
+
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:
-        return await self.root_middleware.run(
-            *args, ctx=ctx, next=next, **kwargs
-        )
+        plan = self.get_dispatch_plan(ctx.event)
+        if plan is None:
+            return MiddlewareResult.IGNORE
+        return await plan.run(*args, ctx=ctx, next=next, **kwargs)
@@ -23,12 +23,38 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import abc
 import asyncio
+import copy
 import enum
-from typing import Any, Callable, List, Optional, Sequence, Type, TypeVar, Union
-
+import functools
+import importlib
+import inspect
+import logging
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from concord.constants import EventType
 from concord.context import Context
 
 
+log = logging.getLogger(__name__)
+
+
 class MiddlewareResult(enum.Enum):
     """Enum values for middleware results.
 
@@ -100,12 +126,43 @@ class Middleware(abc.ABC):
         """
         pass  # pragma: no cover
 
+    @property
+    def event_types(self) -> Optional[FrozenSet[EventType]]:
+        """Event types, that the middleware can successfully process.
+
+        It is a hint for building an execution plan, not a filter. On every
+        other event type the middleware must return an unsuccessful result
+        without any side effects, so it can be skipped without running it.
+
+        Returns:
+            Set of event types, or ``None``, if any event type can be processed.
+        """
+        return None
+
+    def can_process(self, event: EventType) -> bool:
+        """Returns ``True``, if the middleware can successfully process given
+        event type.
+
+        .. seealso::
+            :attr:`event_types`.
+        """
+        event_types = self.event_types
+        return event_types is None or event in event_types
+
     @staticmethod
     def is_successful_result(value: Union[MiddlewareResult, Any]) -> bool:
         """Returns ``True``, if given value is a successful middleware
         result."""
         return is_successful_result(value)
 
+    async def close(self) -> None:
+        """Releases resources, held by the middleware.
+
+        It is invoked on client closing. Middleware can be shared between
+        different trees, so it can be invoked multiple times.
+        """
+        pass
+
     async def __call__(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:
@@ -116,27 +173,236 @@ class Middleware(abc.ABC):
 class MiddlewareFunction(Middleware):
     """Middleware to use function (any callable) as a valid middleware.
 
+    Function can be a coroutine, or a plain function. Plain functions are
+    called directly on the event loop, so they should not block. Plain function
+    can't await the ``next`` callable, therefore it is useful as a last-to-call
+    middleware only. If a plain function returns an awaitable (for example,
+    it is an object with a coroutine ``__call__`` method), it is awaited.
+
     Args:
-        fn: A function to use as a middleware. Should be a coroutine.
+        fn: A function to use as a middleware.
 
     Raises:
-        ValueError: If the given function is not a coroutine.
+        ValueError: If the given function is not a callable.
 
     Attributes:
-        fn: The source function to use as a middleware. A coroutine.
+        fn: The source function to use as a middleware.
+        is_coroutine: Is the source function a coroutine.
     """
 
+    is_coroutine: bool
+
     def __init__(self, fn: Callable):
         super().__init__()
 
-        if not asyncio.iscoroutinefunction(fn):
-            raise ValueError("Not a coroutine")
+        if not callable(fn):
+            raise ValueError("Not a callable")
         self.fn = fn
+        self.is_coroutine = asyncio.iscoroutinefunction(fn)
 
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:
-        return await self.fn(*args, ctx=ctx, next=next, **kwargs)
+        if self.is_coroutine:
+            return await self.fn(*args, ctx=ctx, next=next, **kwargs)
+        result = self.fn(*args, ctx=ctx, next=next, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+
+def _is_plain_function(mw: Middleware) -> bool:
+    """Returns ``True``, if the middleware is a plain function, that can be
+    called without running the middleware."""
+    return type(mw) is MiddlewareFunction and not mw.is_coroutine
+
+
+class MiddlewareExecutor(Middleware):
+    """Middleware to run a blocking function (any callable) in an executor.
+
+    The function is called with positional and keyword parameters, but without
+    context and ``next`` callable, since they can't be passed to another
+    process. Keep in mind, that all of the parameters and the result should be
+    picklable for a process pool.
+
+    By default, the result of the function is returned as a middleware result.
+    If you want to pass the result to the next middleware, provide a ``key``
+    parameter name.
+
+    If no executor provided, a new one will be created on first middleware run
+    and shut down on middleware closing.
+
+    Module-level functions, decorated with :func:`offload` (and possibly with
+    :func:`middleware` decorators above it), can be run in a process pool as
+    well. Since the function's name refers to the middleware, the function is
+    sent to a worker process by its name and resolved there.
+
+    Args:
+        fn: A function to run in an executor.
+        executor: An executor to use.
+        processes: Create a process pool instead of a thread pool.
+        max_workers: Maximum number of workers in a created pool.
+        limit: Maximum number of calls, that are running or waiting for a free
+            worker. Calls over the limit are rejected with an unsuccessful
+            result.
+        key: A parameter name, by which the result will be provided to the
+            next middleware.
+
+    Attributes:
+        fn: The function to run in an executor.
+        executor: The executor to use.
+        processes: Is a process pool should be created instead of a thread
+            pool.
+        max_workers: Maximum number of workers in a created pool.
+        limit: Maximum number of calls, that are running or waiting for a free
+            worker.
+        key: The parameter name, by which the result will be provided to the
+            next middleware, if present.
+        pending: Number of calls, that are running or waiting for a free
+            worker.
+        rejected: Number of calls, rejected due to the limit.
+    """
+
+    executor: Optional[Executor]
+    processes: bool
+    max_workers: Optional[int]
+    limit: Optional[int]
+    key: Optional[str]
+    pending: int
+    rejected: int
+
+    _is_executor_owned: bool
+    _target: Optional[Callable]
+
+    def __init__(
+        self,
+        fn: Callable,
+        *,
+        executor: Optional[Executor] = None,
+        processes: bool = False,
+        max_workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        key: Optional[str] = None,
+    ):
+        super().__init__()
+        self.fn = fn
+        self.executor = executor
+        self.processes = processes
+        self.max_workers = max_workers
+        self.limit = limit
+        self.key = key
+        self.pending = 0
+        self.rejected = 0
+
+        self._is_executor_owned = executor is None
+        self._target = None
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        if self.limit is not None and self.pending >= self.limit:
+            self.rejected += 1
+            return MiddlewareResult.IGNORE
+
+        if self.executor is None:
+            pool_class = (
+                ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            )
+            self.executor = pool_class(max_workers=self.max_workers)
+        if self._target is None:
+            self._target = self._get_target()
+
+        self.pending += 1
+        try:
+            result = await asyncio.get_event_loop().run_in_executor(
+                self.executor, _call_with_kwargs, self._target, args, kwargs
+            )
+        finally:
+            self.pending -= 1
+
+        if self.key is None:
+            return result
+        #
+        kwargs[self.key] = result
+        return await next(*args, ctx=ctx, **kwargs)
+
+    async def close(self) -> None:  # noqa: D102
+        executor = self.executor
+        if not self._is_executor_owned or executor is None:
+            return
+        #
+        self.executor = None
+        await asyncio.get_event_loop().run_in_executor(None, executor.shutdown)
+
+    def _get_target(self) -> Callable:
+        """Returns a callable to send to the executor.
+
+        Decorated module-level function can't be pickled, since its name refers
+        to the middleware, so it is sent by the name instead.
+        """
+        fn = self.fn
+        if not isinstance(self.executor, ProcessPoolExecutor):
+            return fn
+        #
+        module = getattr(fn, "__module__", None)
+        name = getattr(fn, "__qualname__", None)
+        if module is None or name is None:
+            return fn
+        if _find_executor(_import(module, name), module, name) is not self:
+            return fn
+        return functools.partial(_call_by_name, module, name)
+
+
+def _call_with_kwargs(fn: Callable, args: tuple, kwargs: dict) -> Any:
+    """Calls the function with given parameters. Executors don't accept keyword
+    parameters."""
+    return fn(*args, **kwargs)
+
+
+def _import(module: str, name: str) -> Any:
+    """Returns an object by module and qualified names, or ``None``, if there
+    is no such object."""
+    try:
+        obj = importlib.import_module(module)
+    except ImportError:
+        return None
+    #
+    for part in name.split("."):
+        obj = getattr(obj, part, None)
+    return obj
+
+
+def _find_executor(
+    obj: Any, module: str, name: str
+) -> Optional["MiddlewareExecutor"]:
+    """Returns the executor middleware of the function with given module and
+    qualified names. The middleware can be nested in collections, like chains
+    of :func:`middleware` decorator."""
+    if isinstance(obj, MiddlewareExecutor):
+        fn = obj.fn
+        if (
+            getattr(fn, "__module__", None) == module
+            and getattr(fn, "__qualname__", None) == name
+        ):
+            return obj
+    elif isinstance(obj, MiddlewareCollection):
+        for mw in obj.collection:
+            executor = _find_executor(mw, module, name)
+            if executor is not None:
+                return executor
+    #
+    return None
+
+
+def _call_by_name(module: str, name: str, *args, **kwargs) -> Any:
+    """Calls the function by module and qualified names. If the name refers
+    to the executor middleware (or a collection with it), the middleware's
+    function is called."""
+    fn = _import(module, name)
+    executor = _find_executor(fn, module, name)
+    if executor is not None:
+        fn = executor.fn
+    return fn(*args, **kwargs)
 
 
 class MiddlewareState(Middleware):
@@ -156,6 +422,11 @@ class MiddlewareState(Middleware):
     If a :class:`ContextState` subclass provided as the state, it will be
     instantiated for you on every middleware run.
 
+    Every state type gets a fixed slot index on registration (see
+    :meth:`register_state`), and states are stored in the context's slot list.
+    Slot indexes can be used directly to get and set states without looking up
+    the type (see :meth:`get_slot_state` and :meth:`set_slot_state`).
+
     Args:
         state: A state to provide.
         key: A parameter name, by which the state will be provided.
@@ -164,6 +435,9 @@ class MiddlewareState(Middleware):
         state: The state for providing.
         key: The parameter name, by which the state will be provided as a
             parameter, if present.
+        _slot: Slot index of the state type.
+        _slots: Registered state types. Key is a state type, value is a slot
+            index.
     """
 
     StateType = TypeVar("StateType")
@@ -171,18 +445,43 @@ class MiddlewareState(Middleware):
     class ContextState:
         """State that should be instantiated on every middleware run.
 
-        Your state should subclass it.
+        Your state should subclass it. Subclasses are registered on creation.
+
+        Attributes:
+            SLOT: Slot index of the state type.
         """
 
-        pass
+        SLOT: int
+
+        def __init_subclass__(cls, **kwargs):
+            super().__init_subclass__(**kwargs)
+            cls.SLOT = MiddlewareState.register_state(cls)
+
+        @classmethod
+        def from_context(cls, ctx: Context) -> "MiddlewareState.ContextState":
+            """Returns the state from the context. The state is created and
+            saved to the context on first request."""
+            state = MiddlewareState.get_slot_state(ctx, cls.SLOT)
+
+            if state is None:
+                state = cls()
+                MiddlewareState.set_slot_state(ctx, cls.SLOT, state)
+            #
+            return state
 
     state: Any
     key: Optional[str]
 
+    _slot: int
+    _slots: Dict[type, int] = {}
+
     def __init__(self, state: Any, *, key: Optional[str] = None):
         super().__init__()
         self.state = state
         self.key = key
+        self._slot = self.register_state(
+            state if isinstance(state, type) else type(state)
+        )
 
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
@@ -196,30 +495,173 @@ class MiddlewareState(Middleware):
 
         if self.key:
             kwargs[self.key] = state
-        self.set_state(ctx, state)
+        self.set_slot_state(ctx, self._slot, state)
 
         return await next(*args, ctx=ctx, **kwargs)
 
+    @staticmethod
+    def register_state(state_type: type) -> int:
+        """Registers the state type, if it is not registered yet.
+
+        Returns:
+            Slot index of the state type.
+        """
+        slots = MiddlewareState._slots
+        slot = slots.get(state_type)
+
+        if slot is None:
+            slot = slots[state_type] = len(slots)
+        #
+        return slot
+
     @staticmethod
     def get_state(
         ctx: Context, state_type: Type[StateType]
     ) -> Optional[StateType]:
         """Returns a state from the context."""
-        MiddlewareState._ensure_context(ctx)
-        return ctx.states.get(state_type)
+        return MiddlewareState.get_slot_state(
+            ctx, MiddlewareState.register_state(state_type)
+        )
 
     @staticmethod
     def set_state(ctx: Context, state: Any) -> None:
         """Sets the state to the context."""
-        MiddlewareState._ensure_context(ctx)
-        ctx.states[type(state)] = state
+        MiddlewareState.set_slot_state(
+            ctx, MiddlewareState.register_state(type(state)), state
+        )
 
     @staticmethod
-    def _ensure_context(ctx: Context) -> None:
-        """Checks is the context has states storage, and creates it if
-        necessary."""
-        if getattr(ctx, "states", None) is None:
-            ctx.states = dict()
+    def get_slot_state(ctx: Context, slot: int) -> Any:
+        """Returns a state from the context by a slot index."""
+        states = ctx.states
+        if states is None or slot >= len(states):
+            return None
+        return states[slot]
+
+    @staticmethod
+    def set_slot_state(ctx: Context, slot: int, state: Any) -> None:
+        """Sets the state to the context by a slot index.
+
+        Slot list of the context is allocated on first request for all of the
+        registered state types.
+        """
+        states = ctx.states
+        if states is None or slot >= len(states):
+            size = len(MiddlewareState._slots)
+            if states is None:
+                states = ctx.states = [None] * size
+            else:
+                states.extend([None] * (size - len(states)))
+        #
+        states[slot] = state
+
+
+class MiddlewarePredicate(Middleware):
+    """Middleware, that only decides whether the next middleware should be
+    invoked.
+
+    Method :meth:`check` is abstract. It is a plain synchronous function, so
+    chains are able to evaluate consecutive predicates without running any
+    coroutine (see :class:`MiddlewareChain`). Coroutine will be created only
+    for the next middleware, if all of the predicates are passed.
+
+    Predicates should not override :meth:`run`, otherwise they will be run
+    like any other middleware.
+    """
+
+    @abc.abstractmethod
+    def check(self, args: tuple, ctx: Context, kwargs: dict) -> bool:
+        """Checks, whether the next middleware should be invoked.
+
+        Args:
+            args: Positional parameters.
+            ctx: Event processing context.
+            kwargs: Keyword parameters. Predicate can update them, updated
+                parameters will be passed to the next middleware.
+
+        Returns:
+            ``True``, if the next middleware should be invoked.
+        """
+        pass  # pragma: no cover
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        if self.check(args, ctx, kwargs):
+            return await next(*args, ctx=ctx, **kwargs)
+        return MiddlewareResult.IGNORE
+
+
+def _is_inline_predicate(mw: Middleware) -> bool:
+    """Returns ``True``, if the middleware is a predicate, that can be checked
+    without running it."""
+    return (
+        isinstance(mw, MiddlewarePredicate)
+        and type(mw).run is MiddlewarePredicate.run
+    )
+
+
+def _bind_predicates(
+    predicates: Sequence[MiddlewarePredicate], next: Callable
+) -> Callable:
+    """Creates a callable, that checks given predicates in order and invokes
+    the ``next`` callable, if all of them are passed."""
+
+    async def run(*args, ctx: Context, **kwargs):
+        for predicate in predicates:
+            if not predicate.check(args, ctx, kwargs):
+                return MiddlewareResult.IGNORE
+        return await next(*args, ctx=ctx, **kwargs)
+
+    return run
+
+
+def _check_deadline(ctx: Context) -> bool:
+    """Returns ``True`` and marks the context as timed out, if the context's
+    deadline is expired."""
+    if ctx.deadline is not None and ctx.expired:
+        ctx.timed_out = True
+        return True
+    return False
+
+
+def _bind_deadline_check(next: Callable) -> Callable:
+    """Creates a callable, that invokes the ``next`` callable, if the context's
+    deadline is not expired."""
+
+    async def run(*args, ctx: Context, **kwargs):
+        if _check_deadline(ctx):
+            return MiddlewareResult.IGNORE
+        return await next(*args, ctx=ctx, **kwargs)
+
+    return run
+
+
+def _fork_context(ctx: Context) -> Context:
+    """Returns a copy of the context for a concurrently running middleware.
+
+    Per-event states (see :class:`MiddlewareState.ContextState`) and keyword
+    arguments are copied, so concurrently running middleware don't see changes
+    of each other. Other states are shared.
+    """
+    fork = Context(ctx.client, ctx.event, *ctx.args, **ctx.kwargs)
+    fork.deadline = ctx.deadline
+
+    if ctx.states is not None:
+        fork.states = [
+            copy.copy(state)
+            if isinstance(state, MiddlewareState.ContextState)
+            else state
+            for state in ctx.states
+        ]
+    #
+    return fork
+
+
+def _join_contexts(ctx: Context, forks: Sequence[Context]) -> None:
+    """Marks the context as timed out, if any of its forks is timed out."""
+    if any(fork.timed_out for fork in forks):
+        ctx.timed_out = True
 
 
 class MiddlewareCollection(Middleware, abc.ABC):
@@ -261,6 +703,10 @@ class MiddlewareCollection(Middleware, abc.ABC):
         self.collection.append(middleware)
         return middleware
 
+    async def close(self) -> None:  # noqa: D102
+        for mw in self.collection:
+            await mw.close()
+
     @abc.abstractmethod
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
@@ -271,38 +717,137 @@ class MiddlewareCollection(Middleware, abc.ABC):
 class MiddlewareChain(MiddlewareCollection):
     """Middleware collection for chaining middleware.
 
+    Chain is compiled into a ready to call structure of bound ``run`` methods
+    on first run, and then it is reused by subsequent runs with the same
+    ``next`` callable. Compiled chain is dropped on adding a new middleware.
+
+    If the context has a deadline, a separately compiled chain is used, that
+    checks the deadline before invoking every middleware.
+
     Attributes:
         collection: List of middleware to run in a certain order. The first
             items is a last-to-call middleware (in other words, list is
             reversed).
+        _compiled: Compiled chain. It is a tuple of ``next`` callable, chain
+            has been compiled with, leading predicates and a callable, that
+            runs the rest of the chain (see :meth:`compile`).
+        _checked_compiled: Compiled chain with deadline checks.
     """
 
+    _compiled: Optional[
+        Tuple[Callable, Sequence[MiddlewarePredicate], Callable]
+    ]
+    _checked_compiled: Optional[
+        Tuple[Callable, Sequence[MiddlewarePredicate], Callable]
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self._compiled = None
+        self._checked_compiled = None
+
     def add_middleware(
         self, middleware: Middleware
     ) -> Middleware:  # noqa: D102
         super().add_middleware(middleware)
+        self._compiled = None
+        self._checked_compiled = None
         if len(self.collection) == 1:
             self.fn = middleware.fn
         return middleware
 
+    @property
+    def event_types(self) -> Optional[FrozenSet[EventType]]:
+        """Event types of the first-to-call middleware in the chain.
+
+        If the leading middleware can't process an event, the rest of the chain
+        will not be invoked as well.
+        """
+        if not self.collection:
+            return None
+        return self.collection[-1].event_types
+
+    def compile(
+        self, next: Callable, *, checked: bool = False
+    ) -> Tuple[Sequence[MiddlewarePredicate], Callable]:
+        """Binds middleware in the chain with each other.
+
+        Each middleware's ``run`` method is bound with a ``next`` callable,
+        that runs the next middleware in the chain. Last-to-call middleware is
+        bound with given ``next`` callable.
+
+        Consecutive predicates (see :class:`MiddlewarePredicate`) are grouped
+        and checked by a single callable. Leading predicates are returned
+        separately, so they can be checked before running any coroutine.
+
+        If the first-to-call middleware (after leading predicates) is a plain
+        function (see :class:`MiddlewareFunction`), it is bound directly, so
+        returned callable returns the result without creating a coroutine.
+        Caller should await the returned value, if it is awaitable.
+
+        Args:
+            next: Next callable to bind last-to-call middleware with.
+            checked: Check the context's deadline before invoking every
+                middleware (except the first one, it should be checked by the
+                caller).
+
+        Returns:
+            Leading predicates in order of checking, and a callable, that runs
+            the rest of the chain.
+        """
+        outer_next = next
+        predicates = []
+        leading = None
+
+        for current in reversed(self.collection):
+            if not _is_inline_predicate(current):
+                leading = current
+                break
+        #
+        for current in self.collection:
+            if _is_inline_predicate(current):
+                predicates.append(current)
+                continue
+            if predicates:
+                next = _bind_predicates(predicates[::-1], next)
+                predicates = []
+            if checked and next is not outer_next:
+                next = _bind_deadline_check(next)
+            if current is leading and _is_plain_function(current):
+                next = functools.partial(current.fn, next=next)
+            else:
+                next = functools.partial(current.run, next=next)
+        #
+        return predicates[::-1], next
+
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:  # noqa: D102
-        for current in self.collection:
-            # We need to save `current` and `next` middleware in a separate
-            # context for each step. Lambda is a life-hack.
-            # It constructs first lambda with last-to-call middleware and `next`
-            # callable, given by outer scope and runs it. Result is an another
-            # lambda, that is can be used as an `next` callable.
-            # Result lambda overwrites `next` in our scope, next cycle uses the
-            # next middleware in chain order and overwritten `next` callable.
-            # In the end, a lambda chain will be constructed.
-            next = (
-                lambda current, next: lambda *args, ctx, **kwargs: current.run(
-                    *args, ctx=ctx, next=next, **kwargs
+        # Chains are usually called with the same `next` callable (nested
+        # chains get it from the compiled outer chain), so it is enough to
+        # cache the last compiled chain only.
+        if ctx.deadline is None:
+            compiled = self._compiled
+            if compiled is None or compiled[0] is not next:
+                compiled = self._compiled = (next, *self.compile(next))
+        else:
+            if _check_deadline(ctx):
+                return MiddlewareResult.IGNORE
+            compiled = self._checked_compiled
+            if compiled is None or compiled[0] is not next:
+                compiled = self._checked_compiled = (
+                    next,
+                    *self.compile(next, checked=True),
                 )
-            )(current, next)
-        return await next(*args, ctx=ctx, **kwargs)
+        #
+        _, predicates, compiled_next = compiled
+        for predicate in predicates:
+            if not predicate.check(args, ctx, kwargs):
+                return MiddlewareResult.IGNORE
+        result = compiled_next(*args, ctx=ctx, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
 
 
 class MiddlewareSequence(MiddlewareCollection):
@@ -311,9 +856,17 @@ class MiddlewareSequence(MiddlewareCollection):
     It processes all of the middleware list and returns a tuple of results. But
     it returns unsuccessful result if all of the results is unsuccessful.
 
+    If the context's deadline is expired before invoking the next middleware,
+    the sequence is stopped and unsuccessful result is returned.
+
     See :class:`Middleware` for information about successful results.
     """
 
+    @property
+    def event_types(self) -> Optional[FrozenSet[EventType]]:
+        """Union of event types of all middleware in the sequence."""
+        return _union_of_event_types(self.collection)
+
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:  # noqa: D102
@@ -321,7 +874,14 @@ class MiddlewareSequence(MiddlewareCollection):
         successful = False
 
         for mw in self.collection:
-            result = await mw.run(*args, ctx=ctx, next=next, **kwargs)
+            if _check_deadline(ctx):
+                return MiddlewareResult.IGNORE
+            if _is_plain_function(mw):
+                result = mw.fn(*args, ctx=ctx, next=next, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            else:
+                result = await mw.run(*args, ctx=ctx, next=next, **kwargs)
             results.append(result)
             if not successful and self.is_successful_result(result):
                 successful = True
@@ -331,6 +891,96 @@ class MiddlewareSequence(MiddlewareCollection):
         return MiddlewareResult.IGNORE
 
 
+class MiddlewareConcurrentSequence(MiddlewareSequence):
+    """Middleware collection for running middleware concurrently.
+
+    It works like :class:`MiddlewareSequence`, but all of the middleware are
+    run at the same time, so slow middleware doesn't delay the others. Results
+    are in the same order, as middleware in the list.
+
+    If any middleware raises an exception, it doesn't affect the others. After
+    all of the middleware are finished, the first raised exception is
+    re-raised, and the others are logged.
+
+    Every middleware gets own copy of the context, so changes of per-event
+    states (see :class:`MiddlewareState.ContextState`) and keyword arguments
+    are not visible to the others.
+
+    The context's deadline is checked only before running the middleware.
+    """
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        if len(self.collection) < 2:
+            return await super().run(*args, ctx=ctx, next=next, **kwargs)
+        if _check_deadline(ctx):
+            return MiddlewareResult.IGNORE
+        #
+        results = [None] * len(self.collection)
+        indices = []
+        coroutines = []
+        forks = [_fork_context(ctx) for _ in self.collection]
+
+        # Plain functions are called right away, they can't run concurrently
+        # anyway.
+        for index, (mw, fork) in enumerate(zip(self.collection, forks)):
+            if _is_plain_function(mw):
+                try:
+                    result = mw.fn(*args, ctx=fork, next=next, **kwargs)
+                except Exception as exc:
+                    result = exc
+                if not inspect.isawaitable(result):
+                    results[index] = result
+                    continue
+            else:
+                result = mw.run(*args, ctx=fork, next=next, **kwargs)
+            indices.append(index)
+            coroutines.append(result)
+        #
+        if coroutines:
+            gathered = await asyncio.gather(*coroutines, return_exceptions=True)
+            for index, result in zip(indices, gathered):
+                results[index] = result
+        _join_contexts(ctx, forks)
+
+        successful = False
+        error = None
+
+        for result in results:
+            if isinstance(result, BaseException):
+                if error is None:
+                    error = result
+                else:
+                    log.error(
+                        "Exception in concurrent middleware", exc_info=result
+                    )
+            elif not successful and self.is_successful_result(result):
+                successful = True
+        #
+        if error is not None:
+            raise error
+        if successful:
+            return tuple(results)
+        return MiddlewareResult.IGNORE
+
+
+def _union_of_event_types(
+    collection: Sequence[Middleware]
+) -> Optional[FrozenSet[EventType]]:
+    """Returns union of event types of given middleware, or ``None``, if any of
+    them can process any event type."""
+    result = frozenset()
+
+    for mw in collection:
+        event_types = mw.event_types
+        if event_types is None:
+            return None
+        result |= event_types
+    #
+    return result
+
+
 def as_middleware(fn: Callable) -> MiddlewareFunction:
     """Creates a middleware for given function (or any callable).
 
@@ -348,6 +998,33 @@ def as_middleware(fn: Callable) -> MiddlewareFunction:
     return MiddlewareFunction(fn)
 
 
+def offload(
+    *,
+    executor: Optional[Executor] = None,
+    processes: bool = False,
+    max_workers: Optional[int] = None,
+    limit: Optional[int] = None,
+    key: Optional[str] = None,
+) -> Callable[[Callable], MiddlewareExecutor]:
+    """Creates a middleware, that runs decorated function in an executor. A
+    decorator.
+
+    See :class:`MiddlewareExecutor` for parameters description.
+    """
+
+    def decorator(fn: Callable) -> MiddlewareExecutor:
+        return MiddlewareExecutor(
+            fn,
+            executor=executor,
+            processes=processes,
+            max_workers=max_workers,
+            limit=limit,
+            key=key,
+        )
+
+    return decorator
+
+
 def collection_of(
     collection_class: Type[MiddlewareCollection],
     middleware: Sequence[Union[Middleware, Callable]],
@@ -409,6 +1086,24 @@ def sequence_of(
     return collection_of(MiddlewareSequence, middleware)
 
 
+def concurrent_sequence_of(
+    middleware: Sequence[Union[Middleware, Callable]]
+) -> MiddlewareConcurrentSequence:
+    """Creates a new concurrent sequence
+    (:class:`MiddlewareConcurrentSequence`) of given middleware.
+
+    If any of given parameters is not a middleware, a middleware will be created
+    for it for you.
+
+    Args:
+        middleware: A list of middleware to create sequence of.
+
+    Returns:
+        Concurrent sequence of given middleware.
+    """
+    return collection_of(MiddlewareConcurrentSequence, middleware)
+
+
 def middleware(outer_middleware: Middleware):
     """Appends a middleware to the chain. A decorator.
 
@@ -438,15 +1133,151 @@ class OneOfAll(MiddlewareCollection):
     It processes the middleware list until one of them returns a successful
     result.
 
+    If the context's deadline is expired before invoking the next middleware,
+    processing is stopped and unsuccessful result is returned.
+
     See :class:`Middleware` for information about successful results.
     """
 
+    @property
+    def event_types(self) -> Optional[FrozenSet[EventType]]:
+        """Union of event types of all middleware in the collection."""
+        return _union_of_event_types(self.collection)
+
     async def run(
         self, *args, ctx: Context, next: Callable, **kwargs
     ) -> Union[MiddlewareResult, Any]:  # noqa: D102
         for mw in self.collection:
-            result = await mw.run(*args, ctx=ctx, next=next, **kwargs)
+            if _check_deadline(ctx):
+                return MiddlewareResult.IGNORE
+            if _is_plain_function(mw):
+                result = mw.fn(*args, ctx=ctx, next=next, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            else:
+                result = await mw.run(*args, ctx=ctx, next=next, **kwargs)
             if self.is_successful_result(result):
                 return result
         #
         return MiddlewareResult.IGNORE
+
+
+class RacingOneOfAll(OneOfAll):
+    """Middleware collection with "first success" condition, that runs
+    middleware concurrently.
+
+    All of the middleware are started at the same time. The first successful
+    result is returned, and the rest of middleware are cancelled. If a grace
+    window is set, middleware, that are earlier in the list than the winner,
+    can still finish during this window, and their successful result will be
+    preferred.
+
+    If no middleware returns a successful result, the first raised exception
+    in the list order is re-raised, if any.
+
+    The context's deadline is checked only before running the middleware.
+
+    Every middleware gets own copy of the context, like in
+    :class:`MiddlewareConcurrentSequence`.
+
+    See :class:`Middleware` for information about successful results.
+
+    Args:
+        grace: Grace window in seconds.
+
+    Attributes:
+        grace: Grace window in seconds.
+    """
+
+    grace: float
+
+    def __init__(self, *, grace: float = 0.0):
+        super().__init__()
+        self.grace = grace
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        if len(self.collection) < 2:
+            return await super().run(*args, ctx=ctx, next=next, **kwargs)
+        if _check_deadline(ctx):
+            return MiddlewareResult.IGNORE
+        #
+        forks = [_fork_context(ctx) for _ in self.collection]
+        tasks = [
+            asyncio.ensure_future(mw.run(*args, ctx=fork, next=next, **kwargs))
+            for mw, fork in zip(self.collection, forks)
+        ]
+
+        try:
+            return await self._race(tasks)
+        finally:
+            _join_contexts(ctx, forks)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark exceptions of losers as retrieved
+                    task.exception()
+
+    async def _race(
+        self, tasks: List[asyncio.Future]
+    ) -> Union[MiddlewareResult, Any]:
+        loop = asyncio.get_event_loop()
+        winner = None
+        deadline = None
+
+        while True:
+            if winner is None:
+                waiting = [task for task in tasks if not task.done()]
+                timeout = None
+            else:
+                waiting = [task for task in tasks[:winner] if not task.done()]
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+            if not waiting:
+                break
+            #
+            await asyncio.wait(
+                waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for index, task in enumerate(tasks[:winner]):
+                if (
+                    task.done()
+                    and task.exception() is None
+                    and self.is_successful_result(task.result())
+                ):
+                    winner = index
+                    break
+            if winner is not None and deadline is None:
+                deadline = loop.time() + self.grace
+        #
+        if winner is not None:
+            return tasks[winner].result()
+        for task in tasks:
+            if task.exception() is not None:
+                raise task.exception()
+        return MiddlewareResult.IGNORE
+
+
+def race_of(
+    middleware: Sequence[Union[Middleware, Callable]], *, grace: float = 0.0
+) -> RacingOneOfAll:
+    """Creates a new racing collection (:class:`RacingOneOfAll`) of given
+    middleware.
+
+    If any of given parameters is not a middleware, a middleware will be created
+    for it for you.
+
+    Args:
+        middleware: A list of middleware to create collection of.
+        grace: Grace window in seconds.
+
+    Returns:
+        Racing collection of given middleware.
+    """
+    collection = collection_of(RacingOneOfAll, middleware)
+    collection.grace = grace
+    return collection
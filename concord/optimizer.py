@@ -0,0 +1,157 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from typing import List, NamedTuple, Tuple
+
+from concord.middleware import (
+    Middleware,
+    MiddlewareChain,
+    MiddlewareCollection,
+    MiddlewareConcurrentSequence,
+    MiddlewareSequence,
+    OneOfAll,
+)
+
+
+SEQUENCE_CLASSES = (MiddlewareSequence, MiddlewareConcurrentSequence)
+
+
+class TreeStats(NamedTuple):
+    """Middleware tree statistics.
+
+    Attributes:
+        depth: Maximum number of nested middleware, including the root one.
+        nodes: Total number of middleware in the tree.
+    """
+
+    depth: int
+    nodes: int
+
+
+def get_tree_stats(mw: Middleware) -> TreeStats:
+    """Calculates statistics of given middleware tree.
+
+    Args:
+        mw: Root middleware of the tree.
+
+    Returns:
+        Tree statistics.
+    """
+    if not isinstance(mw, MiddlewareCollection) or not mw.collection:
+        return TreeStats(1, 1)
+    #
+    stats = [get_tree_stats(child) for child in mw.collection]
+    return TreeStats(
+        1 + max(s.depth for s in stats), 1 + sum(s.nodes for s in stats)
+    )
+
+
+def optimize(mw: Middleware) -> Middleware:
+    """Builds an equivalent, but shallower middleware tree.
+
+    Optimizations, that are applied:
+
+    * Nested chains are merged into the outer chain. Empty nested chains are
+      removed, since they just call the ``next`` callable.
+    * Nested :class:`concord.middleware.OneOfAll` collections are merged into
+      the outer one. Empty sequences and collections are removed from it, since
+      they always return an unsuccessful result.
+    * Chains and :class:`concord.middleware.OneOfAll` collections with a single
+      middleware are replaced with this middleware.
+
+    Sequences (see :data:`SEQUENCE_CLASSES`) are never merged or replaced,
+    since they return a tuple of results. Only exact collection classes are
+    optimized, subclasses can have their own behavior and are left as is, as
+    well as any other middleware.
+
+    Given tree is not modified, optimized collections are copied.
+
+    Args:
+        mw: Root middleware of the tree to optimize.
+
+    Returns:
+        Root middleware of the optimized tree.
+    """
+    if type(mw) is MiddlewareChain:
+        collection = _flatten_chain(mw)
+    elif type(mw) is OneOfAll:
+        collection = _flatten_one_of_all(mw)
+    elif type(mw) in SEQUENCE_CLASSES:
+        collection = [optimize(child) for child in mw.collection]
+    else:
+        return mw
+    #
+    if len(collection) == 1 and type(mw) not in SEQUENCE_CLASSES:
+        return collection[0]
+
+    optimized = type(mw)()
+    for child in collection:
+        optimized.add_middleware(child)
+    return optimized
+
+
+def optimize_with_stats(
+    mw: Middleware
+) -> Tuple[Middleware, TreeStats, TreeStats]:
+    """Optimizes given middleware tree and calculates statistics of the tree
+    before and after optimization.
+
+    See :func:`optimize` and :func:`get_tree_stats`.
+
+    Returns:
+        Root middleware of the optimized tree, statistics of given tree and of
+        the optimized tree.
+    """
+    optimized = optimize(mw)
+    return optimized, get_tree_stats(mw), get_tree_stats(optimized)
+
+
+def _flatten_chain(chain: MiddlewareChain) -> List[Middleware]:
+    collection = []
+
+    for child in chain.collection:
+        child = optimize(child)
+        if type(child) is MiddlewareChain:
+            # Inner chain calls its middleware before the outer `next`, so it
+            # takes the same place in the outer chain. Empty chain just calls
+            # the `next` callable.
+            collection.extend(child.collection)
+        else:
+            collection.append(child)
+    #
+    return collection
+
+
+def _flatten_one_of_all(one_of_all: OneOfAll) -> List[Middleware]:
+    collection = []
+
+    for child in one_of_all.collection:
+        child = optimize(child)
+        if type(child) is OneOfAll:
+            collection.extend(child.collection)
+        elif type(child) in SEQUENCE_CLASSES and not child.collection:
+            continue
+        else:
+            collection.append(child)
+    #
+    return collection
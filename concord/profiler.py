@@ -0,0 +1,271 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import bisect
+import copy
+import time
+from typing import Any, Callable, List, Optional, Union
+
+from concord.context import Context
+from concord.middleware import (
+    Middleware,
+    MiddlewareCollection,
+    MiddlewareResult,
+)
+
+
+class Histogram:
+    """Histogram of durations with fixed logarithmic buckets.
+
+    Upper bounds of buckets are powers of two microseconds, from 1 us to about
+    16.8 s. Durations above the last bound are counted in an overflow bucket.
+
+    Attributes:
+        BOUNDS: Upper bounds of buckets, in seconds.
+        buckets: Number of durations in each bucket. Last one is the overflow
+            bucket.
+        count: Total number of durations.
+        total: Sum of durations, in seconds.
+    """
+
+    BOUNDS = tuple(2 ** k / 1_000_000 for k in range(25))
+
+    buckets: List[int]
+    count: int
+    total: float
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        """Records given duration, in seconds."""
+        self.buckets[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns an upper bound of given percentile of durations.
+
+        Args:
+            q: Percentile, from 0 to 100.
+
+        Returns:
+            Upper bound of the bucket, the percentile is in, in seconds.
+            ``float("inf")`` for the overflow bucket, or ``None``, if there is
+            no recorded durations.
+        """
+        if not self.count:
+            return None
+        #
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= rank and seen:
+                return self.BOUNDS[i]
+        return float("inf")
+
+
+class ProfiledMiddleware(Middleware):
+    """Middleware, that collects statistics of the wrapped middleware.
+
+    Time, spent in the ``next`` callable, is measured separately as downstream
+    time, so self time of the middleware can be calculated (see
+    :attr:`self_time`).
+
+    Args:
+        mw: Middleware to profile.
+        children: Profiled children of the middleware, if it is a collection.
+
+    Attributes:
+        mw: Profiled middleware.
+        children: Profiled children of the middleware.
+        calls: Number of runs.
+        ignored: Number of runs with unsuccessful results.
+        errors: Number of runs with raised exceptions.
+        histogram: Histogram of total time of runs.
+        downstream_time: Time, spent in the ``next`` callable, in seconds.
+        _next: Last ``next`` callable, given to the middleware.
+        _timed_next: Wrapper of the last ``next`` callable, that measures
+            downstream time. It is reused to keep chains compiled.
+    """
+
+    mw: Middleware
+    children: List["ProfiledMiddleware"]
+    calls: int
+    ignored: int
+    errors: int
+    histogram: Histogram
+    downstream_time: float
+
+    _next: Optional[Callable]
+    _timed_next: Optional[Callable]
+
+    def __init__(
+        self,
+        mw: Middleware,
+        children: Optional[List["ProfiledMiddleware"]] = None,
+    ):
+        super().__init__()
+        self.mw = mw
+        self.fn = mw.fn
+        self.children = [] if children is None else children
+        self.calls = 0
+        self.ignored = 0
+        self.errors = 0
+        self.histogram = Histogram()
+        self.downstream_time = 0.0
+        self._next = None
+        self._timed_next = None
+
+    @property
+    def name(self) -> str:
+        """Name of the profiled middleware."""
+        name = type(self.mw).__name__
+        fn = self.mw.fn
+        if fn is not None and not isinstance(self.mw, MiddlewareCollection):
+            name += f"({getattr(fn, '__qualname__', repr(fn))})"
+        return name
+
+    @property
+    def total_time(self) -> float:
+        """Total time of runs, in seconds."""
+        return self.histogram.total
+
+    @property
+    def self_time(self) -> float:
+        """Time of runs, spent in the middleware itself, in seconds.
+
+        It doesn't include downstream time and self time of children.
+        """
+        return (
+            self.total_time
+            - self.downstream_time
+            - sum(c.total_time - c.downstream_time for c in self.children)
+        )
+
+    @property
+    def event_types(self):  # noqa: D102
+        return self.mw.event_types
+
+    def _get_timed_next(self, next: Callable) -> Callable:
+        if self._next is not next:
+
+            async def timed_next(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await next(*args, **kwargs)
+                finally:
+                    self.downstream_time += time.perf_counter() - start
+
+            self._next = next
+            self._timed_next = timed_next
+        #
+        return self._timed_next
+
+    async def run(
+        self, *args, ctx: Context, next: Callable, **kwargs
+    ) -> Union[MiddlewareResult, Any]:  # noqa: D102
+        timed_next = self._get_timed_next(next)
+        start = time.perf_counter()
+
+        try:
+            result = await self.mw.run(
+                *args, ctx=ctx, next=timed_next, **kwargs
+            )
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.calls += 1
+            self.histogram.record(time.perf_counter() - start)
+        #
+        if not self.is_successful_result(result):
+            self.ignored += 1
+        return result
+
+
+def profile(mw: Middleware) -> ProfiledMiddleware:
+    """Wraps every node of given middleware tree for profiling.
+
+    Collections are copied with profiled children, given tree is not modified.
+
+    Args:
+        mw: Root middleware of the tree to profile.
+
+    Returns:
+        Profiled root middleware.
+    """
+    if not isinstance(mw, MiddlewareCollection):
+        return ProfiledMiddleware(mw)
+    #
+    children = [profile(child) for child in mw.collection]
+    profiled = copy.copy(mw)
+    # Adding middleware drops compiled chains of the copy as well
+    profiled.collection = []
+    for child in children:
+        profiled.add_middleware(child)
+    return ProfiledMiddleware(profiled, children)
+
+
+def format_report(profiled: ProfiledMiddleware, *, indent: int = 0) -> str:
+    """Formats a tree-shaped report of profiled middleware.
+
+    Args:
+        profiled: Profiled root middleware.
+        indent: Indentation level of the root middleware.
+
+    Returns:
+        Report, a line per middleware.
+    """
+    lines = []
+    _format_node(profiled, indent, lines)
+    return "\n".join(lines)
+
+
+def _format_duration(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value == float("inf"):
+        return "inf"
+    if value < 0.001:
+        return f"{value * 1_000_000:.1f} us"
+    return f"{value * 1000:.2f} ms"
+
+
+def _format_node(node: ProfiledMiddleware, indent: int, lines: List[str]):
+    ignored = node.ignored / node.calls * 100 if node.calls else 0.0
+    lines.append(
+        f"{'  ' * indent}{node.name}: "
+        f"calls {node.calls}, "
+        f"ignored {ignored:.1f}%, "
+        f"errors {node.errors}, "
+        f"total {_format_duration(node.total_time)}, "
+        f"self {_format_duration(max(node.self_time, 0.0))}, "
+        f"p50 {_format_duration(node.histogram.percentile(50))}, "
+        f"p99 {_format_duration(node.histogram.percentile(99))}"
+    )
+    for child in node.children:
+        _format_node(child, indent + 1, lines)
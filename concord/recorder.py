@@ -0,0 +1,190 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import IO, Any, Iterator, List, Optional, Tuple
+
+import discord
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.dispatcher import Dispatcher
+from concord.extension import Manager
+from concord.utils import empty_next_callable, from_plain_data, to_plain_data
+
+
+log = logging.getLogger(__name__)
+
+
+#: Recorded event. It is a tuple of an offset in seconds from the recording
+#: start, event's name, positional and keyword arguments as plain data.
+Record = Tuple[float, str, List[Any], dict]
+
+
+class RecordingDispatcher(Dispatcher):
+    """Dispatcher, that records events, passed to another dispatcher.
+
+    Events are appended to the file as JSON lines, one event per line, see
+    :data:`Record`. Arguments are converted into plain data by
+    :func:`concord.utils.to_plain_data`. Events, skipped by the client, are not
+    recorded.
+
+    Recordings can be replayed by :func:`replay`.
+
+    Args:
+        dispatcher: Dispatcher to pass events to.
+        path: Path to the file to append events to.
+
+    Attributes:
+        dispatcher: Dispatcher to pass events to.
+        path: Path to the file to append events to.
+        recorded: Number of recorded events.
+    """
+
+    dispatcher: Dispatcher
+    path: str
+    recorded: int
+
+    _file: Optional[IO[str]]
+    _started_at: float
+
+    def __init__(self, dispatcher: Dispatcher, path: str):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.path = path
+        self.recorded = 0
+
+        self._file = None
+        self._started_at = 0.0
+
+    def bind(self, client: discord.Client) -> None:  # noqa: D102
+        super().bind(client)
+        self.dispatcher.bind(client)
+
+    def dispatch(self, event: str, ctx: Context) -> None:  # noqa: D102
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._started_at = time.monotonic()
+
+        record = (
+            round(time.monotonic() - self._started_at, 6),
+            event,
+            to_plain_data(list(ctx.args)),
+            to_plain_data(ctx.kwargs),
+        )
+        self._file.write(
+            json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        )
+        self.recorded += 1
+
+        self.dispatcher.dispatch(event, ctx)
+
+    async def close(self) -> None:  # noqa: D102
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        #
+        await self.dispatcher.close()
+
+
+def read_recording(path: str) -> Iterator[Record]:
+    """Reads recorded events from the file.
+
+    Args:
+        path: Path to the recording.
+
+    Returns:
+        Iterator over recorded events.
+    """
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                offset, event, args, kwargs = json.loads(line)
+                yield offset, event, args, kwargs
+
+
+async def replay(
+    path: str,
+    manager: Manager,
+    *,
+    client: Optional[discord.Client] = None,
+    realtime: bool = False,
+) -> Tuple[int, int, float]:
+    """Replays recorded events through the extension manager.
+
+    Events are processed one by one. By default, they are processed as fast as
+    possible, which is useful for throughput benchmarks. With real time pacing,
+    every event is processed not earlier than it has been recorded, relative to
+    the replay start.
+
+    Recorded arguments are converted into objects with attributes (see
+    :func:`concord.utils.from_plain_data`), so extensions can read them like
+    discord.py objects. Keep in mind, that nested objects are recorded up to
+    limited depth, and type checks against discord.py classes don't pass.
+
+    Exceptions, raised by processing of an event, are logged and counted, and
+    don't stop the replay.
+
+    Args:
+        path: Path to the recording.
+        manager: Extension manager to process events by.
+        client: Client to create contexts with.
+        realtime: Keep original pacing of events.
+
+    Returns:
+        Number of replayed events, number of events, that failed to process,
+        and elapsed time in seconds.
+    """
+    loop = asyncio.get_event_loop()
+    started_at = loop.time()
+    count = 0
+    failed = 0
+
+    for offset, event, args, kwargs in read_recording(path):
+        if realtime:
+            delay = started_at + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        try:
+            event_type = EventType(event)
+        except ValueError:
+            event_type = EventType.UNKNOWN
+        #
+        ctx = Context(
+            client,
+            event_type,
+            *from_plain_data(args),
+            **{k: from_plain_data(v) for k, v in kwargs.items()},
+        )
+        try:
+            await manager.run(ctx=ctx, next=empty_next_callable)
+        except Exception:
+            log.exception(f"Failed to replay event `{event}`")
+            failed += 1
+        count += 1
+
+    return count, failed, loop.time() - started_at
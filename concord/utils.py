@@ -21,9 +21,22 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import datetime
+import enum
+import types
+from typing import Any
+
 from concord.context import Context
 
 
+#: Types of values, that are considered as plain data.
+PLAIN_TYPES = (type(None), bool, int, float, str, bytes)
+
+# Class attributes of these types are not properties, even if they are
+# descriptors.
+_NOT_PROPERTY_TYPES = (types.FunctionType, classmethod, staticmethod)
+
+
 async def empty_next_callable(
     *args, ctx: Context, **kwargs
 ) -> None:  # noqa: D401
@@ -37,3 +50,96 @@ async def empty_next_callable(
     Empty callable just immediately returns.
     """
     pass  # pragma: no cover
+
+
+def to_plain_data(value: Any, *, depth: int = 2) -> Any:
+    """Converts a value into plain data.
+
+    Plain data consists of primitive values, lists and dicts only. It can be
+    safely pickled or serialized, and passed to another process or stored.
+
+    Primitive values are kept as is. Enum members are replaced by their values,
+    date and time values are replaced by ISO 8601 strings. Lists, tuples and
+    sets are converted into lists, mappings are converted into dicts.
+
+    Other objects are converted into dicts of their public attributes and
+    properties (properties, that raise an exception, are skipped). Objects,
+    that are nested deeper than given depth, are replaced by their ``id``
+    attribute (or ``None``, if there is no such attribute).
+
+    Args:
+        value: A value to convert.
+        depth: Maximum depth of objects to convert into dicts.
+
+    Returns:
+        Plain data.
+    """
+    if isinstance(value, PLAIN_TYPES):
+        return value
+    if isinstance(value, enum.Enum):
+        return to_plain_data(value.value, depth=depth)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_plain_data(item, depth=depth) for item in value]
+    if isinstance(value, dict):
+        return {
+            (k if isinstance(k, PLAIN_TYPES) else str(k)): to_plain_data(
+                v, depth=depth
+            )
+            for k, v in value.items()
+        }
+    if depth <= 0:
+        return to_plain_data(getattr(value, "id", None), depth=0)
+    #
+    names = set(getattr(value, "__dict__", ()))
+    for klass in type(value).__mro__:
+        slots = getattr(klass, "__slots__", ())
+        names.update((slots,) if isinstance(slots, str) else slots)
+        # Properties, like attributes of discord.py members, that are taken
+        # from the underlying user.
+        for name, attribute in vars(klass).items():
+            if not isinstance(attribute, _NOT_PROPERTY_TYPES) and hasattr(
+                type(attribute), "__get__"
+            ):
+                names.add(name)
+
+    data = {}
+    for name in sorted(names):
+        if name.startswith("_"):
+            continue
+        try:
+            attribute = getattr(value, name)
+        except Exception:
+            continue
+        if callable(attribute):
+            continue
+        data[name] = to_plain_data(attribute, depth=depth - 1)
+    #
+    return data
+
+
+def from_plain_data(value: Any) -> Any:
+    """Converts plain data into objects with attributes.
+
+    It is a reverse of :func:`to_plain_data` for reading values only, original
+    types are not restored. Dicts with string keys are converted into
+    :class:`types.SimpleNamespace` objects, so values can be accessed as
+    attributes, like ``message.author.bot``. Lists are converted item by item,
+    other values are kept as is.
+
+    Args:
+        value: Plain data to convert.
+
+    Returns:
+        Converted value.
+    """
+    if isinstance(value, list):
+        return [from_plain_data(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    #
+    data = {k: from_plain_data(v) for k, v in value.items()}
+    if all(isinstance(k, str) and k.isidentifier() for k in data):
+        return types.SimpleNamespace(**data)
+    return data
@@ -0,0 +1,99 @@
+# Measuring middleware chain overhead.
+# Compares compiled chains with chains, built from scratch on every run, as it
+# was done before. Should be started from the project root.
+
+import asyncio
+import sys
+import timeit
+
+sys.path.insert(0, ".")
+
+from concord.constants import EventType  # noqa: E402
+from concord.context import Context  # noqa: E402
+from concord.ext.base import EventTypeFilter  # noqa: E402
+from concord.middleware import (  # noqa: E402
+    MiddlewareChain,
+    MiddlewareResult,
+    chain_of,
+)
+from concord.utils import empty_next_callable  # noqa: E402
+
+
+DEPTHS = (1, 5, 20, 50)
+NUMBER = 20000
+
+
+class LegacyMiddlewareChain(MiddlewareChain):
+    """Chain, that builds lambdas on every run."""
+
+    async def run(self, *args, ctx, next, **kwargs):
+        for current in self.collection:
+            next = (
+                lambda current, next: lambda *args, ctx, **kwargs: current.run(
+                    *args, ctx=ctx, next=next, **kwargs
+                )
+            )(current, next)
+        return await next(*args, ctx=ctx, **kwargs)
+
+
+class AsyncEventTypeFilter(EventTypeFilter):
+    """Event type filter, that is run as a coroutine."""
+
+    async def run(self, *args, ctx, next, **kwargs):
+        if ctx.event == self.event:
+            return await next(*args, ctx=ctx, **kwargs)
+        return MiddlewareResult.IGNORE
+
+
+async def passthrough(*args, ctx, next, **kwargs):
+    return await next(*args, ctx=ctx, **kwargs)
+
+
+def make_chain(cls, depth):
+    chain = cls()
+    for mw in chain_of([passthrough] * depth).collection:
+        chain.add_middleware(mw)
+    return chain
+
+
+def make_filtering_chain(cls, depth):
+    return chain_of(
+        [passthrough] + [cls(EventType.MESSAGE) for _ in range(depth)]
+    )
+
+
+def measure(loop, chain):
+    ctx = Context(None, EventType.TYPING)
+
+    async def run():
+        for _ in range(NUMBER):
+            await chain.run(1, 2, ctx=ctx, next=empty_next_callable, key=3)
+
+    return timeit.timeit(lambda: loop.run_until_complete(run()), number=1)
+
+
+if __name__ == "__main__":
+    loop = asyncio.get_event_loop()
+
+    print(f"{'depth':>6} {'legacy, us':>12} {'compiled, us':>14} {'ratio':>6}")
+    for depth in DEPTHS:
+        legacy = measure(loop, make_chain(LegacyMiddlewareChain, depth))
+        compiled = measure(loop, make_chain(MiddlewareChain, depth))
+        print(
+            f"{depth:>6} {legacy / NUMBER * 1e6:>12.2f} "
+            f"{compiled / NUMBER * 1e6:>14.2f} {legacy / compiled:>6.2f}"
+        )
+
+    print()
+    print(
+        f"{'filters':>7} {'async, us':>11} {'predicate, us':>15} {'ratio':>6}"
+    )
+    for depth in DEPTHS:
+        legacy = measure(
+            loop, make_filtering_chain(AsyncEventTypeFilter, depth)
+        )
+        compiled = measure(loop, make_filtering_chain(EventTypeFilter, depth))
+        print(
+            f"{depth:>7} {legacy / NUMBER * 1e6:>11.2f} "
+            f"{compiled / NUMBER * 1e6:>15.2f} {legacy / compiled:>6.2f}"
+        )
@@ -25,11 +25,14 @@ from typing import Sequence
 
 import pytest
 
+from concord.constants import EventType
 from concord.exceptions import ExtensionManagerError
 from concord.extension import Extension, Manager
 from concord.middleware import (
     Middleware,
     MiddlewareChain,
+    MiddlewareConcurrentSequence,
+    MiddlewareResult,
     MiddlewareSequence,
     MiddlewareState,
     as_middleware,
@@ -92,6 +95,16 @@ def test_types(extension):
     assert isinstance(manager.root_middleware, MiddlewareChain)
     assert isinstance(manager.root_middleware.collection[0], MiddlewareSequence)
 
+    manager = Manager(sequence_class=MiddlewareConcurrentSequence)
+    manager.register_extension(extension)
+    assert isinstance(
+        manager.root_middleware.collection[0], MiddlewareConcurrentSequence
+    )
+    assert isinstance(
+        manager.get_dispatch_plan(EventType.READY).collection[0],
+        MiddlewareConcurrentSequence,
+    )
+
 
 def test_registering(extension):
     manager = Manager()
@@ -159,3 +172,124 @@ async def test_running_behaviour(extension, context, sample_parameters):
         return 42
 
     assert await manager.run(*sa, ctx=context, next=next, **skwa) == (42,)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_plan(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    class FilteringMiddleware(Middleware):
+        def __init__(self, event):
+            super().__init__()
+            self.event = event
+
+        @property
+        def event_types(self):
+            return frozenset((self.event,))
+
+        async def run(self, *args, ctx, next, **kwargs):
+            assert ctx.event == self.event
+            return await next(*args, ctx=ctx, **kwargs)
+
+    @as_middleware
+    async def handler(*args, ctx, next, **kwargs):
+        return 42
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self) -> Sequence[Middleware]:
+            return [chain_of([handler, FilteringMiddleware(EventType.READY)])]
+
+    manager = Manager()
+    assert manager.event_types == frozenset()
+    manager.register_extension(SomeExtension)
+
+    assert manager.event_types == {EventType.READY}
+    assert manager.can_process(EventType.READY)
+    assert not manager.can_process(EventType.UNKNOWN)
+    assert manager.get_dispatch_plan(EventType.UNKNOWN) is None
+    assert manager.get_dispatch_plan(EventType.READY) is not None
+    assert manager.get_dispatch_plan(
+        EventType.READY
+    ) is manager.get_dispatch_plan(EventType.READY)
+
+    result = await manager.run(*sa, ctx=context, next=None, **skwa)
+    assert result == MiddlewareResult.IGNORE
+
+    context.event = EventType.READY
+    result = await manager.run(*sa, ctx=context, next=None, **skwa)
+    assert result == (42,)
+
+    manager.unregister_extension(SomeExtension)
+    assert manager.get_dispatch_plan(EventType.READY) is None
+
+
+def test_batched_events_suppression():
+    class FilteringMiddleware(Middleware):
+        def __init__(self, *events):
+            super().__init__()
+            self.events = frozenset(events)
+
+        @property
+        def event_types(self):
+            return self.events
+
+        async def run(self, *args, ctx, next, **kwargs):
+            pass  # pragma: no cover
+
+    single = FilteringMiddleware(EventType.GUILD_AVAILABLE)
+    batch = FilteringMiddleware(EventType.GUILD_AVAILABLE_BATCH)
+
+    class SingleExtension(Extension):
+        @property
+        def extension_middleware(self) -> Sequence[Middleware]:
+            return [single]
+
+    class BatchExtension(Extension):
+        @property
+        def extension_middleware(self) -> Sequence[Middleware]:
+            return [single, batch]
+
+    def get_middleware(manager, event):
+        # Single-element chain of the sequence is optimized out
+        return manager.get_dispatch_plan(event).collection
+
+    for suppress, expected in ((False, [single, single]), (True, [single])):
+        manager = Manager(suppress_batched_events=suppress)
+        manager.register_extension(SingleExtension)
+        manager.register_extension(BatchExtension)
+
+        assert get_middleware(manager, EventType.GUILD_AVAILABLE) == expected
+        assert get_middleware(manager, EventType.GUILD_AVAILABLE_BATCH) == [
+            batch
+        ]
+
+
+@pytest.mark.asyncio
+async def test_closing():
+    closed = []
+
+    class ClosingMiddleware(Middleware):
+        async def run(self, *args, ctx, next, **kwargs):
+            pass  # pragma: no cover
+
+        async def close(self):
+            closed.append(self)
+
+    client_mw = ClosingMiddleware()
+    extension_mw = ClosingMiddleware()
+
+    class SomeExtension(Extension):
+        @property
+        def client_middleware(self) -> Sequence[Middleware]:
+            return [client_mw]
+
+        @property
+        def extension_middleware(self) -> Sequence[Middleware]:
+            return [chain_of([extension_mw])]
+
+    manager = Manager()
+    manager.register_extension(SomeExtension)
+    await manager.close()
+
+    assert closed == [extension_mw, client_mw]
@@ -25,6 +25,7 @@ import pytest
 
 from concord.middleware import (
     MiddlewareChain,
+    MiddlewareResult,
     chain_of,
     collection_of,
     middleware,
@@ -66,6 +67,38 @@ async def test_running_behaviour(context, sample_parameters):
     assert await chain.run(*sa, ctx=context, next=next, **skwa) == 42 + 1 + 2
 
 
+@pytest.mark.asyncio
+async def test_compiling(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        return await next(*args, ctx=ctx, **kwargs) + 1
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        return await next(*args, ctx=ctx, **kwargs) + 2
+
+    async def next(*args, ctx, **kwargs):
+        return 42
+
+    async def another_next(*args, ctx, **kwargs):
+        return 0
+
+    chain = collection_of(MiddlewareChain, [first_mw])
+    assert await chain.run(*sa, ctx=context, next=next, **skwa) == 42 + 1
+    compiled = chain._compiled
+    assert compiled[0] is next
+    # Compiled chain should be reused with the same `next`
+    assert await chain.run(*sa, ctx=context, next=next, **skwa) == 42 + 1
+    assert chain._compiled is compiled
+    # ... and recompiled with another one
+    assert await chain.run(*sa, ctx=context, next=another_next, **skwa) == 1
+    assert chain._compiled[0] is another_next
+    # Adding a middleware should invalidate compiled chain
+    chain.add_middleware(collection_of(MiddlewareChain, [second_mw]))
+    assert chain._compiled is None
+    assert await chain.run(*sa, ctx=context, next=next, **skwa) == 42 + 1 + 2
+
+
 def test_helper():
     async def first_mw(*args, ctx, next, **kwargs):
         pass
@@ -108,3 +141,29 @@ async def test_decorator_with_inner_chain():
     assert isinstance(chain, MiddlewareChain)
     assert chain == inner_chain
     assert [mw.fn for mw in chain.collection] == [first_mw, second_mw, third_mw]
+
+
+@pytest.mark.asyncio
+async def test_deadline(context, sample_parameters):
+    sa, skwa = sample_parameters
+    ran = []
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        ran.append(1)  # pragma: no cover
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        ran.append(2)
+        ctx.set_timeout(-1)
+        return await next(*args, ctx=ctx, **kwargs)
+
+    chain = collection_of(MiddlewareChain, [first_mw, second_mw])
+
+    context.set_timeout(10)
+    result = await chain.run(*sa, ctx=context, next=None, **skwa)
+    assert result == MiddlewareResult.IGNORE
+    assert ran == [2] and context.timed_out
+
+    # Expired deadline should stop the chain before the first middleware
+    result = await chain.run(*sa, ctx=context, next=None, **skwa)
+    assert result == MiddlewareResult.IGNORE
+    assert ran == [2]
@@ -0,0 +1,118 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.middleware import (
+    MiddlewareConcurrentSequence,
+    MiddlewareResult,
+    MiddlewareSequence,
+    concurrent_sequence_of,
+)
+from concord.utils import empty_next_callable
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour(context, sample_parameters):
+    sa, skwa = sample_parameters
+    order = []
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        await asyncio.sleep(0.02)
+        order.append(1)
+        return 1
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        order.append(2)
+        return MiddlewareResult.IGNORE
+
+    seq = concurrent_sequence_of([first_mw, second_mw])
+    assert await seq.run(
+        *sa, ctx=context, next=empty_next_callable, **skwa
+    ) == (1, MiddlewareResult.IGNORE)
+    # Second middleware should not wait for the first one
+    assert order == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour_on_ignoring(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        return MiddlewareResult.IGNORE
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        return MiddlewareResult.IGNORE
+
+    for middleware in ([], [first_mw], [first_mw, second_mw]):
+        seq = concurrent_sequence_of(middleware)
+        assert (
+            await seq.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+            == MiddlewareResult.IGNORE
+        )
+
+
+@pytest.mark.asyncio
+async def test_exceptions_isolation(context, sample_parameters):
+    sa, skwa = sample_parameters
+    finished = []
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        raise RuntimeError()
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        await asyncio.sleep(0.01)
+        finished.append(2)
+
+    seq = concurrent_sequence_of([first_mw, second_mw])
+    with pytest.raises(RuntimeError):
+        await seq.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert finished == [2]
+
+
+@pytest.mark.asyncio
+async def test_multiple_exceptions(context, sample_parameters, caplog):
+    sa, skwa = sample_parameters
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        raise RuntimeError()
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        raise KeyError()
+
+    seq = concurrent_sequence_of([first_mw, second_mw])
+    with pytest.raises(RuntimeError):
+        await seq.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert len(caplog.records) == 1
+    assert caplog.records[0].exc_info[0] is KeyError
+
+
+def test_helper():
+    async def first_mw(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    seq = concurrent_sequence_of([first_mw])
+    assert isinstance(seq, MiddlewareConcurrentSequence)
+    assert isinstance(seq, MiddlewareSequence)
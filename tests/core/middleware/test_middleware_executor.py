@@ -0,0 +1,160 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from concord.constants import EventType
+from concord.ext.base import EventTypeFilter
+from concord.middleware import (
+    MiddlewareExecutor,
+    MiddlewareResult,
+    middleware,
+    offload,
+)
+from concord.utils import empty_next_callable
+
+
+def get_pid(*args, **kwargs):
+    return os.getpid()
+
+
+@offload(processes=True, max_workers=1)
+def get_offloaded_pid(*args, **kwargs):
+    return os.getpid()
+
+
+@middleware(EventTypeFilter(EventType.UNKNOWN))
+@offload(processes=True, max_workers=1)
+def get_filtered_offloaded_pid(*args, **kwargs):
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    def fn(*args, **kwargs):
+        assert list(args) == sa and kwargs == skwa
+        return threading.get_ident()
+
+    mw = MiddlewareExecutor(fn)
+    result = await mw.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+
+    assert result != threading.get_ident()
+    assert mw.fn == fn and mw.pending == 0
+    await mw.close()
+    assert mw.executor is None
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour_with_key(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    def fn(*args, **kwargs):
+        return 42
+
+    async def next(*args, ctx, result, **kwargs):
+        assert ctx == context and list(args) == sa and kwargs == skwa
+        return result + 1
+
+    mw = MiddlewareExecutor(fn, key="result")
+    assert await mw.run(*sa, ctx=context, next=next, **skwa) == 43
+    await mw.close()
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour_in_processes(context):
+    mw = MiddlewareExecutor(get_pid, processes=True, max_workers=1)
+    result = await mw.run(ctx=context, next=empty_next_callable)
+
+    assert result != os.getpid()
+    await mw.close()
+
+
+@pytest.mark.asyncio
+async def test_decorated_in_processes(context):
+    mw = get_offloaded_pid
+    result = await mw.run(1, ctx=context, next=empty_next_callable, a=2)
+
+    assert result != os.getpid()
+    await mw.close()
+
+
+@pytest.mark.asyncio
+async def test_composed_in_processes(context):
+    mw = get_filtered_offloaded_pid
+    result = await mw.run(1, ctx=context, next=empty_next_callable, a=2)
+
+    assert isinstance(result, int) and result != os.getpid()
+    await mw.close()
+
+
+@pytest.mark.asyncio
+async def test_limit(context):
+    event = threading.Event()
+
+    mw = MiddlewareExecutor(event.wait, max_workers=1, limit=1)
+    first = asyncio.ensure_future(mw.run(ctx=context, next=empty_next_callable))
+    await asyncio.sleep(0)
+
+    result = await mw.run(ctx=context, next=empty_next_callable)
+    assert result == MiddlewareResult.IGNORE
+    assert mw.pending == 1 and mw.rejected == 1
+
+    event.set()
+    assert await first
+    await mw.close()
+
+
+@pytest.mark.asyncio
+async def test_external_executor(context):
+    executor = ThreadPoolExecutor(max_workers=1)
+    mw = MiddlewareExecutor(get_pid, executor=executor)
+
+    assert await mw.run(ctx=context, next=empty_next_callable) == os.getpid()
+    await mw.close()
+    # Executor is not owned by the middleware, it should be alive.
+    assert mw.executor == executor
+    assert executor.submit(get_pid).result() == os.getpid()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_decorator(context):
+    async def outer(*args, ctx, next, **kwargs):
+        return await next(*args, ctx=ctx, value=42, **kwargs)
+
+    @middleware(outer)
+    @offload(max_workers=1)
+    def fn(*args, value, **kwargs):
+        return value + 1
+
+    assert isinstance(fn.collection[0], MiddlewareExecutor)
+    assert await fn.run(ctx=context, next=empty_next_callable) == 43
+    await fn.close()
+    assert fn.collection[0].executor is None
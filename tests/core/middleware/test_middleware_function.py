@@ -21,9 +21,21 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import functools
+
 import pytest
 
-from concord.middleware import MiddlewareFunction, as_middleware
+from concord.middleware import (
+    MiddlewareFunction,
+    MiddlewareResult,
+    OneOfAll,
+    as_middleware,
+    chain_of,
+    collection_of,
+    concurrent_sequence_of,
+    sequence_of,
+)
+from concord.utils import empty_next_callable
 
 
 def test_function_converting():
@@ -34,11 +46,8 @@ def test_function_converting():
 
 
 def test_function_constraints():
-    def mw(*args, ctx, next, **kwargs):
-        pass
-
     with pytest.raises(ValueError):
-        MiddlewareFunction(mw)
+        MiddlewareFunction(42)
 
 
 @pytest.mark.asyncio
@@ -66,3 +75,100 @@ async def test_helper():
 
     assert isinstance(converted_mw, MiddlewareFunction)
     assert converted_mw.fn == mw
+
+
+@pytest.mark.asyncio
+async def test_plain_function(context, sample_parameters):
+    sa, skwa = sample_parameters
+    calls = []
+
+    def sync_mw(*args, ctx, next, **kwargs):
+        # Concurrent sequence provides a copy of the context
+        assert ctx.event == context.event
+        assert list(args) == sa and kwargs == skwa
+        calls.append(1)
+        return 42
+
+    def ignoring_mw(*args, ctx, next, **kwargs):
+        return MiddlewareResult.IGNORE
+
+    mw = as_middleware(sync_mw)
+    assert not mw.is_coroutine
+    assert (
+        await mw.run(*sa, ctx=context, next=empty_next_callable, **skwa) == 42
+    )
+
+    for collection, expected in (
+        (sequence_of([ignoring_mw, sync_mw]), (MiddlewareResult.IGNORE, 42)),
+        (
+            concurrent_sequence_of([sync_mw, mw, ignoring_mw]),
+            (42, 42, MiddlewareResult.IGNORE),
+        ),
+        (collection_of(OneOfAll, [ignoring_mw, sync_mw]), 42),
+    ):
+        assert (
+            await collection.run(
+                *sa, ctx=context, next=empty_next_callable, **skwa
+            )
+            == expected
+        )
+    assert len(calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_plain_function_exceptions(context, sample_parameters):
+    sa, skwa = sample_parameters
+    finished = []
+
+    def failing_mw(*args, ctx, next, **kwargs):
+        raise RuntimeError()
+
+    async def async_mw(*args, ctx, next, **kwargs):
+        finished.append(1)
+
+    seq = concurrent_sequence_of([failing_mw, async_mw])
+    with pytest.raises(RuntimeError):
+        await seq.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert finished == [1]
+
+
+@pytest.mark.asyncio
+async def test_awaitable_results(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    class Handler:
+        async def __call__(self, *args, ctx, next, **kwargs):
+            return 42
+
+    async def coroutine_mw(value, *args, ctx, next, **kwargs):
+        return value
+
+    for fn in (Handler(), functools.partial(coroutine_mw, 42)):
+        for collection, expected in (
+            (as_middleware(fn), 42),
+            (chain_of([fn]), 42),
+            (sequence_of([fn]), (42,)),
+            (concurrent_sequence_of([fn, fn]), (42, 42)),
+            (collection_of(OneOfAll, [fn]), 42),
+        ):
+            assert (
+                await collection.run(
+                    *sa, ctx=context, next=empty_next_callable, **skwa
+                )
+                == expected
+            )
+
+
+def test_plain_function_in_chain(context):
+    def sync_mw(*args, ctx, next, **kwargs):
+        return 42
+
+    async def async_mw(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    # First-to-call plain function is called without a coroutine
+    _, compiled = chain_of([sync_mw]).compile(empty_next_callable)
+    assert compiled(ctx=context) == 42
+
+    _, compiled = chain_of([async_mw, sync_mw]).compile(empty_next_callable)
+    assert compiled(ctx=context) == 42
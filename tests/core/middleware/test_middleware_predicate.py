@@ -0,0 +1,125 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import pytest
+
+from concord.middleware import (
+    MiddlewarePredicate,
+    MiddlewareResult,
+    chain_of,
+)
+from concord.utils import empty_next_callable
+
+
+class KeyPredicate(MiddlewarePredicate):
+    def __init__(self, key, checked):
+        super().__init__()
+        self.key = key
+        self.checked = checked
+
+    def check(self, args, ctx, kwargs):
+        self.checked.append(self.key)
+        if self.key in kwargs:
+            return False
+        kwargs[self.key] = True
+        return True
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour(context, sample_parameters):
+    sa, skwa = sample_parameters
+    checked = []
+
+    async def next(*args, ctx, **kwargs):
+        assert kwargs.pop("first") is True
+        return 42
+
+    predicate = KeyPredicate("first", checked)
+    assert await predicate.run(*sa, ctx=context, next=next, **skwa) == 42
+    assert (
+        await predicate.run(
+            *sa, ctx=context, next=empty_next_callable, first=False, **skwa
+        )
+        == MiddlewareResult.IGNORE
+    )
+    assert checked == ["first", "first"]
+
+
+@pytest.mark.asyncio
+async def test_chain_inlining(context, sample_parameters):
+    sa, skwa = sample_parameters
+    checked = []
+    ran = []
+
+    async def mw(*args, ctx, next, **kwargs):
+        ran.append(sorted(kwargs))
+        return await next(*args, ctx=ctx, **kwargs)
+
+    async def handler(*args, ctx, next, **kwargs):
+        return sorted(kwargs)
+
+    chain = chain_of(
+        [
+            handler,
+            KeyPredicate("d", checked),
+            KeyPredicate("c", checked),
+            mw,
+            KeyPredicate("b", checked),
+            KeyPredicate("a", checked),
+        ]
+    )
+    predicates, _ = chain.compile(empty_next_callable)
+    assert [p.key for p in predicates] == ["a", "b"]
+
+    result = await chain.run(*sa, ctx=context, next=empty_next_callable)
+    assert result == ["a", "b", "c", "d"]
+    assert checked == ["a", "b", "c", "d"]
+    assert ran == [["a", "b"]]
+
+    checked.clear()
+    ran.clear()
+    result = await chain.run(*sa, ctx=context, next=empty_next_callable, b=1)
+    assert result == MiddlewareResult.IGNORE
+    assert checked == ["a", "b"]
+    assert ran == []
+
+    result = await chain.run(*sa, ctx=context, next=empty_next_callable, c=1)
+    assert result == MiddlewareResult.IGNORE
+    assert ran == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_overridden_run(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    class RunningPredicate(KeyPredicate):
+        async def run(self, *args, ctx, next, **kwargs):
+            return 0
+
+    async def handler(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    chain = chain_of([handler, RunningPredicate("a", [])])
+    predicates, _ = chain.compile(empty_next_callable)
+    assert predicates == []
+    assert await chain.run(*sa, ctx=context, next=empty_next_callable) == 0
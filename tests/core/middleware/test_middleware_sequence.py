@@ -23,9 +23,12 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import pytest
 
+from concord.constants import EventType
 from concord.middleware import (
+    Middleware,
     MiddlewareResult,
     MiddlewareSequence,
+    chain_of,
     collection_of,
     sequence_of,
 )
@@ -80,3 +83,53 @@ def test_helper():
     chain = sequence_of([first_mw, second_mw])
     # Just check that, `collection_of` covers all of the other stuff to check.
     assert isinstance(chain, MiddlewareSequence)
+
+
+def test_event_types():
+    class SomeMiddleware(Middleware):
+        def __init__(self, *events):
+            super().__init__()
+            self.events = frozenset(events)
+
+        @property
+        def event_types(self):
+            return self.events
+
+        async def run(self, *args, ctx, next, **kwargs):
+            pass  # pragma: no cover
+
+    async def any_mw(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    first_mw = SomeMiddleware(EventType.READY)
+    second_mw = SomeMiddleware(EventType.MESSAGE, EventType.TYPING)
+
+    assert sequence_of([]).event_types == frozenset()
+    assert sequence_of([first_mw, second_mw]).event_types == {
+        EventType.READY,
+        EventType.MESSAGE,
+        EventType.TYPING,
+    }
+    assert sequence_of([first_mw, any_mw]).event_types is None
+    assert chain_of([any_mw, first_mw]).event_types == {EventType.READY}
+    assert chain_of([first_mw, any_mw]).event_types is None
+
+
+@pytest.mark.asyncio
+async def test_deadline(context, sample_parameters):
+    sa, skwa = sample_parameters
+    ran = []
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        ran.append(1)
+        ctx.set_timeout(-1)
+        return 1
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        ran.append(2)  # pragma: no cover
+
+    seq = sequence_of([first_mw, second_mw])
+    context.set_timeout(10)
+    result = await seq.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert result == MiddlewareResult.IGNORE
+    assert ran == [1] and context.timed_out
@@ -38,8 +38,8 @@ async def test_running_behaviour_on_defaults(context, sample_parameters):
 
     async def next(*args, ctx, **kwargs):
         assert ctx == context and list(args) == sa and kwargs == skwa
-        assert hasattr(ctx, "states")
-        assert ctx.states.get(State) == state
+        slot = MiddlewareState.register_state(State)
+        assert ctx.states[slot] == state
         assert MiddlewareState.get_state(ctx, State) == state
         return 42
 
@@ -58,8 +58,8 @@ async def test_running_behaviour_with_key(context, sample_parameters):
 
     async def next(*args, ctx, my_state, **kwargs):
         assert ctx == context and list(args) == sa and kwargs == skwa
-        assert hasattr(ctx, "states")
-        assert ctx.states.get(State) == state
+        slot = MiddlewareState.register_state(State)
+        assert ctx.states[slot] == state
         assert MiddlewareState.get_state(ctx, State) == state
         assert my_state == state
         return 42
@@ -112,3 +112,39 @@ async def test_running_behaviour_with_context_state(context, sample_parameters):
 
     assert await ms.run(*sa, ctx=context, next=next, **skwa) == 42
     assert ms.state == State
+
+
+def test_registration():
+    class State:
+        pass
+
+    class ContextState(MiddlewareState.ContextState):
+        pass
+
+    slot = MiddlewareState.register_state(State)
+    assert MiddlewareState.register_state(State) == slot
+    assert MiddlewareState.register_state(ContextState) == ContextState.SLOT
+    assert ContextState.SLOT != slot
+
+
+def test_slot_states(context):
+    class State(MiddlewareState.ContextState):
+        pass
+
+    assert MiddlewareState.get_slot_state(context, State.SLOT) is None
+
+    state = State.from_context(context)
+    assert isinstance(state, State)
+    assert State.from_context(context) is state
+    assert MiddlewareState.get_slot_state(context, State.SLOT) is state
+    assert MiddlewareState.get_state(context, State) is state
+
+    # Types registered after slots allocation are stored as well
+    class OtherState(MiddlewareState.ContextState):
+        pass
+
+    other_state = OtherState()
+    MiddlewareState.set_state(context, other_state)
+    slot = OtherState.SLOT
+    assert MiddlewareState.get_slot_state(context, slot) is other_state
+    assert State.from_context(context) is state
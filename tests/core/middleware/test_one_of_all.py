@@ -58,3 +58,23 @@ async def test_running_behaviour_with_no_result(context, sample_parameters):
         await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa)
         == MiddlewareResult.IGNORE
     )
+
+
+@pytest.mark.asyncio
+async def test_deadline(context, sample_parameters):
+    sa, skwa = sample_parameters
+    ran = []
+
+    async def first_mw(*args, ctx, next, **kwargs):
+        ran.append(1)
+        ctx.set_timeout(-1)
+        return MiddlewareResult.IGNORE
+
+    async def second_mw(*args, ctx, next, **kwargs):
+        ran.append(2)  # pragma: no cover
+
+    ooa = collection_of(OneOfAll, [first_mw, second_mw])
+    context.set_timeout(10)
+    result = await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert result == MiddlewareResult.IGNORE
+    assert ran == [1] and context.timed_out
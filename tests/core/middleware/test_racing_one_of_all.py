@@ -0,0 +1,123 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.middleware import (
+    MiddlewareResult,
+    OneOfAll,
+    RacingOneOfAll,
+    race_of,
+)
+from concord.utils import empty_next_callable
+
+
+def make_mw(delay, result, cancelled=None):
+    async def mw(*args, ctx, next, **kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(result)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return mw
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour(context, sample_parameters):
+    sa, skwa = sample_parameters
+    cancelled = []
+
+    ooa = race_of(
+        [
+            make_mw(0.1, 1, cancelled),
+            make_mw(0, MiddlewareResult.IGNORE),
+            make_mw(0.01, 3),
+        ]
+    )
+    assert (
+        await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa) == 3
+    )
+    await asyncio.sleep(0)
+    assert cancelled == [1]
+
+
+@pytest.mark.asyncio
+async def test_grace_window(context, sample_parameters):
+    sa, skwa = sample_parameters
+    cancelled = []
+
+    ooa = race_of(
+        [
+            make_mw(0.02, 1),
+            make_mw(0.01, 2),
+            make_mw(0, 3),
+            make_mw(0.5, 4, cancelled),
+        ],
+        grace=0.1,
+    )
+    # The first one is finished in the grace window and should be preferred
+    assert (
+        await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa) == 1
+    )
+
+    ooa = race_of([make_mw(0.5, 1, cancelled), make_mw(0, 2)], grace=0.01)
+    assert (
+        await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa) == 2
+    )
+    await asyncio.sleep(0)
+    assert cancelled == [4, 1]
+
+
+@pytest.mark.asyncio
+async def test_running_behaviour_with_no_result(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    ooa = race_of([make_mw(0, MiddlewareResult.IGNORE)] * 2)
+    assert (
+        await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+        == MiddlewareResult.IGNORE
+    )
+
+    ooa = race_of(
+        [
+            make_mw(0, MiddlewareResult.IGNORE),
+            make_mw(0.01, ValueError()),
+            make_mw(0, RuntimeError()),
+        ]
+    )
+    with pytest.raises(ValueError):
+        await ooa.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+
+
+def test_helper():
+    ooa = race_of([make_mw(0, 1)], grace=1.0)
+    assert isinstance(ooa, RacingOneOfAll)
+    assert isinstance(ooa, OneOfAll)
+    assert ooa.grace == 1.0
@@ -28,8 +28,10 @@ import pytest
 
 from concord.client import Client, create_client
 from concord.constants import EventType
+from concord.dispatcher import Dispatcher
 from concord.extension import Extension
-from concord.middleware import as_middleware
+from concord.middleware import Middleware, as_middleware
+from tests.helpers import make_discord_object
 
 
 @pytest.mark.asyncio
@@ -44,7 +46,7 @@ async def test_event_dispatching(event_loop, sample_parameters):
             @as_middleware
             async def mw(*args, ctx, next, **kwargs):
                 assert ctx.event == EventType(event)
-                assert ctx.args == sa
+                assert ctx.args == tuple(sa)
                 assert ctx.kwargs == skwa
                 result.set()
 
@@ -79,6 +81,112 @@ async def test_unknown_event_dispatching(event_loop):
     await client.close()
 
 
+@pytest.mark.asyncio
+async def test_skipping_unprocessable_events(event_loop):
+    dispatched = []
+
+    class SomeDispatcher(Dispatcher):
+        def dispatch(self, event, ctx):
+            dispatched.append(ctx.event)
+
+    class SomeMiddleware(Middleware):
+        @property
+        def event_types(self):
+            return frozenset((EventType.MESSAGE,))
+
+        async def run(self, *args, ctx, next, **kwargs):
+            pass  # pragma: no cover
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            return [SomeMiddleware()]
+
+    client = Client(dispatcher=SomeDispatcher())
+    client.dispatch("message")
+    assert dispatched == []
+
+    client.extension_manager.register_extension(SomeExtension)
+    client.dispatch("socket_raw_receive", "")
+    client.dispatch("firework!")
+    client.dispatch("message")
+    assert dispatched == [EventType.MESSAGE]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_timeouts(event_loop):
+    dispatched = []
+
+    class SomeDispatcher(Dispatcher):
+        def dispatch(self, event, ctx):
+            dispatched.append(ctx)
+
+    @as_middleware
+    async def mw(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            return [mw]
+
+    client = Client(
+        dispatcher=SomeDispatcher(), timeouts={EventType.MESSAGE: 10}
+    )
+    client.extension_manager.register_extension(SomeExtension)
+    client.dispatch("message")
+    client.dispatch("typing")
+    assert 9 < dispatched[0].remaining <= 10
+    assert dispatched[1].deadline is None
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_guild_available_batching(event_loop):
+    dispatched = []
+
+    class SomeDispatcher(Dispatcher):
+        def dispatch(self, event, ctx):
+            dispatched.append((ctx.event, list(ctx.args)))
+
+    @as_middleware
+    async def mw(*args, ctx, next, **kwargs):
+        pass  # pragma: no cover
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            return [mw]
+
+    first = make_discord_object(1, shard_id=0)
+    second = make_discord_object(2, shard_id=1)
+    third = make_discord_object(3, shard_id=0)
+    batch = EventType.GUILD_AVAILABLE_BATCH
+
+    client = Client(dispatcher=SomeDispatcher(), batch_guild_available=True)
+    client.extension_manager.register_extension(SomeExtension)
+
+    client.dispatch("connect")
+    client.dispatch("guild_available", first)
+    client.dispatch("guild_available", second)
+    client.dispatch("shard_ready", 0)
+    client.dispatch("ready")
+    client.dispatch("guild_available", third)
+
+    assert [item for item in dispatched if item[0] == batch] == [
+        (batch, [[first]]),
+        (batch, [[second]]),
+        (batch, [[third]]),
+    ]
+    assert [
+        args[0]
+        for event, args in dispatched
+        if event == EventType.GUILD_AVAILABLE
+    ] == [first, second, third]
+    await client.close()
+
+
 def test_custom_client_creation():
     class CustomClient(discord.Client):
         pass
@@ -21,6 +21,8 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import pytest
+
 from concord.constants import EventType
 from concord.context import Context
 
@@ -31,5 +33,39 @@ def test_context(client, sample_parameters):
 
     assert context.client == client
     assert context.event == EventType.UNKNOWN
-    assert context.args == sa
+    assert context.args == tuple(sa)
     assert context.kwargs == skwa
+
+
+def test_deadline(client):
+    context = Context(client, EventType.UNKNOWN)
+    assert context.deadline is None and context.remaining is None
+    assert not context.expired and not context.timed_out
+
+    context.set_timeout(10)
+    assert 9 < context.remaining <= 10
+    assert not context.expired
+
+    context.set_timeout(-1)
+    assert context.remaining == 0
+    assert context.expired
+
+    context.set_timeout(None)
+    assert context.deadline is None
+
+
+def test_fields(client):
+    context = Context(client, EventType.MESSAGE_EDIT, 1, 2, 3)
+    assert context.fields == {"before": 1, "after": 2}
+    assert context.fields is context.fields
+
+    context = Context(client, EventType.UNKNOWN, 1, 2, 3)
+    assert context.fields == {}
+
+
+def test_slots(client):
+    context = Context(client, EventType.UNKNOWN)
+    assert not hasattr(context, "__dict__")
+
+    with pytest.raises(AttributeError):
+        context.something = 42
@@ -0,0 +1,600 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+
+import pytest
+
+from concord.client import Client
+from concord.constants import EventType
+from concord.context import Context
+from concord.dispatcher import (
+    CoalescingDispatcher,
+    KeyedDispatcher,
+    OverflowPolicy,
+    Priority,
+    PriorityDispatcher,
+    ProcessDispatcher,
+    QueueDispatcher,
+    SheddingPolicy,
+    TaskDispatcher,
+    author_key,
+    channel_key,
+    guild_key,
+    merge_before_after,
+)
+from concord.ext.base import BotFilter, EventTypeFilter, PatternFilter
+from concord.extension import Extension
+from concord.middleware import (
+    Middleware,
+    MiddlewareResult,
+    OneOfAll,
+    as_middleware,
+    chain_of,
+    collection_of,
+)
+from tests.helpers import make_discord_object, make_guild_message
+
+
+def make_client(dispatcher, events):
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                events.append(ctx.args[0])
+
+            return [mw]
+
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+    return client
+
+
+async def wait_for_queue(dispatcher):
+    while len(dispatcher) > 0:
+        await asyncio.sleep(0)
+    # Let workers finish processing of the last events.
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize(
+    "policy,expected,dropped",
+    [
+        (OverflowPolicy.BLOCK, [0, 1, 2, 3, 4], 0),
+        (OverflowPolicy.DROP_OLDEST, [3, 4], 3),
+        (OverflowPolicy.DROP_NEWEST, [0, 1], 3),
+    ],
+)
+@pytest.mark.asyncio
+async def test_overflow_policies(event_loop, policy, expected, dropped):
+    events = []
+    dispatcher = QueueDispatcher(size=2, workers=1, policy=policy)
+    client = make_client(dispatcher, events)
+
+    # Workers are not running until we give the control to the loop.
+    for i in range(5):
+        client.dispatch("message", i)
+    await wait_for_queue(dispatcher)
+
+    assert events == expected
+    assert dispatcher.dropped == dropped
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_backlog_limit(event_loop):
+    events = []
+    dispatcher = QueueDispatcher(size=2, workers=1, backlog_size=1)
+    client = make_client(dispatcher, events)
+
+    for i in range(5):
+        client.dispatch("message", i)
+    await wait_for_queue(dispatcher)
+
+    assert events == [0, 1, 2]
+    assert dispatcher.dropped == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_shedding(event_loop):
+    events = []
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                if ctx.args[0] == "slow":
+                    await asyncio.sleep(0.05)
+                events.append(ctx.args[0])
+
+            return [mw]
+
+    dispatcher = QueueDispatcher(
+        workers=1,
+        slo=0.01,
+        shedding={
+            EventType.TYPING: SheddingPolicy.DROP,
+            EventType.GUILD_AVAILABLE: SheddingPolicy.SAMPLE,
+            EventType.MEMBER_UPDATE: SheddingPolicy.DEFER,
+        },
+        sample_rate=2,
+    )
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    client.dispatch("message", "slow")
+    client.dispatch("typing", "typing")
+    client.dispatch("guild_available", "first guild")
+    client.dispatch("guild_available", "second guild")
+    client.dispatch("member_update", "member")
+    client.dispatch("message", "message")
+    await asyncio.sleep(0.1)
+
+    assert events == ["slow", "second guild", "message", "member"]
+    assert dispatcher.shed == {
+        EventType.TYPING: 1,
+        EventType.GUILD_AVAILABLE: 1,
+        EventType.MEMBER_UPDATE: 1,
+    }
+    assert dispatcher.wait_time > 0.01
+    assert len(dispatcher) == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_deferred_overflow(event_loop):
+    events = []
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                if ctx.args[0] == "slow":
+                    await asyncio.sleep(0.05)
+                events.append(ctx.args[0])
+
+            return [mw]
+
+    dispatcher = QueueDispatcher(
+        size=1,
+        workers=1,
+        slo=0.01,
+        shedding={EventType.MEMBER_UPDATE: SheddingPolicy.DEFER},
+    )
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    client.dispatch("message", "slow")
+    client.dispatch("member_update", "first")
+    client.dispatch("member_update", "second")
+    await asyncio.sleep(0.1)
+
+    # The first deferred event is evicted by the second one
+    assert events == ["slow", "second"]
+    assert dispatcher.shed == {EventType.MEMBER_UPDATE: 2}
+    assert dispatcher.dropped == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_workers_limit(event_loop):
+    running = 0
+    max_running = 0
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0)
+                running -= 1
+
+            return [mw]
+
+    dispatcher = QueueDispatcher(size=100, workers=3)
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    for i in range(20):
+        client.dispatch("message", i)
+    await wait_for_queue(dispatcher)
+
+    assert max_running == 3
+    await client.close()
+    assert len(dispatcher) == 0
+
+
+def test_constraints():
+    with pytest.raises(ValueError):
+        QueueDispatcher(size=0)
+    with pytest.raises(ValueError):
+        QueueDispatcher(workers=0)
+    with pytest.raises(ValueError):
+        QueueDispatcher(backlog_size=-1)
+    with pytest.raises(ValueError):
+        QueueDispatcher(sample_rate=0)
+
+
+@pytest.mark.asyncio
+async def test_keyed_ordering(event_loop):
+    events = []
+    started = []
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                key, i = ctx.args
+                started.append((key, i))
+                await asyncio.sleep(0)
+                events.append((key, i))
+
+            return [mw]
+
+    dispatcher = KeyedDispatcher(key=lambda ctx: ctx.args[0])
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    for i in range(3):
+        client.dispatch("message", "a", i)
+        client.dispatch("message", "b", i)
+    assert len(dispatcher) == 2
+
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+    # Events with the same key are processed one by one, in order.
+    assert [i for key, i in events if key == "a"] == [0, 1, 2]
+    assert [i for key, i in events if key == "b"] == [0, 1, 2]
+    # Different keys are processed concurrently.
+    assert started[:2] == [("a", 0), ("b", 0)]
+    # Idle lanes are removed.
+    assert len(dispatcher) == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_keyed_without_key(event_loop):
+    events = []
+    dispatcher = KeyedDispatcher(key=lambda ctx: None)
+    client = make_client(dispatcher, events)
+
+    client.dispatch("message", 1)
+    assert len(dispatcher) == 0
+    await asyncio.sleep(0)
+
+    assert events == [1]
+    await client.close()
+
+
+def test_keys(client):
+    guild = make_discord_object(1)
+    payload = make_discord_object(2, channel_id=3, guild_id=4, user_id=6)
+
+    assert author_key(Context(client, EventType.UNKNOWN, 42)) is None
+    assert author_key(Context(client, EventType.UNKNOWN, payload)) == 6
+    assert guild_key(Context(client, EventType.UNKNOWN, 42)) is None
+    assert channel_key(Context(client, EventType.UNKNOWN, 42)) is None
+    assert guild_key(Context(client, EventType.UNKNOWN, payload)) == 4
+    assert channel_key(Context(client, EventType.UNKNOWN, payload)) == 3
+    assert (
+        guild_key(
+            Context(
+                client, EventType.UNKNOWN, make_discord_object(5, guild=guild)
+            )
+        )
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_coalescing(event_loop):
+    events = []
+    dispatcher = CoalescingDispatcher(
+        TaskDispatcher(),
+        {EventType.TYPING: lambda ctx: ctx.args[0] // 10},
+        window=0.01,
+    )
+    client = make_client(dispatcher, events)
+
+    for i in (10, 11, 20, 12):
+        client.dispatch("typing", i)
+    client.dispatch("message", 13)
+    await asyncio.sleep(0)
+
+    assert events == [13]
+    assert len(dispatcher) == 2
+    assert dispatcher.coalesced == 2
+
+    await asyncio.sleep(0.05)
+    assert sorted(events) == [12, 13, 20]
+    assert len(dispatcher) == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_merge(event_loop):
+    events = []
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                events.append(ctx.args)
+
+            return [mw]
+
+    dispatcher = CoalescingDispatcher(
+        TaskDispatcher(),
+        {EventType.MEMBER_UPDATE: lambda ctx: 42},
+        window=10.0,
+        merge=merge_before_after,
+    )
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    client.dispatch("member_update", 1, 2)
+    client.dispatch("member_update", 2, 3)
+    client.dispatch("member_update", 3, 4)
+    await asyncio.sleep(0)
+    assert events == []
+
+    # Pending events are flushed on close.
+    await client.close()
+    await asyncio.sleep(0)
+    assert [list(args) for args in events] == [[1, 4]]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_merge_by_event_type(event_loop):
+    events = []
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                events.append((ctx.event, list(ctx.args)))
+
+            return [mw]
+
+    dispatcher = CoalescingDispatcher(
+        TaskDispatcher(),
+        {
+            EventType.MEMBER_UPDATE: lambda ctx: 42,
+            EventType.TYPING: lambda ctx: 42,
+        },
+        window=10.0,
+        merge={EventType.MEMBER_UPDATE: merge_before_after},
+    )
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+
+    client.dispatch("member_update", 1, 2)
+    client.dispatch("member_update", 2, 3)
+    client.dispatch("typing", "channel", "first", 1)
+    client.dispatch("typing", "channel", "second", 2)
+
+    await client.close()
+    await asyncio.sleep(0)
+    assert sorted(events, key=lambda e: e[0].value) == [
+        (EventType.MEMBER_UPDATE, [1, 3]),
+        (EventType.TYPING, ["channel", "second", 2]),
+    ]
+
+
+def test_merge_before_after(client):
+    previous = Context(client, EventType.TYPING, "channel", "first", 1)
+    current = Context(client, EventType.TYPING, "channel", "second", 2)
+    assert merge_before_after(previous, current) is current
+
+    previous = Context(client, EventType.VOICE_STATE_UPDATE, "member", 1, 2)
+    current = Context(client, EventType.VOICE_STATE_UPDATE, "member", 2, 3)
+    current.set_timeout(10)
+
+    merged = merge_before_after(previous, current)
+    assert list(merged.args) == ["member", 1, 3]
+    assert merged.deadline == current.deadline
+
+
+@pytest.mark.asyncio
+async def test_priorities(event_loop):
+    events = []
+    dispatcher = PriorityDispatcher(
+        workers=1,
+        weights={Priority.HIGH: 2, Priority.NORMAL: 1, Priority.LOW: 1},
+    )
+    client = make_client(dispatcher, events)
+
+    for i in range(3):
+        client.dispatch("guild_available", f"low{i}")
+    for i in range(3):
+        client.dispatch("message", f"high{i}")
+    await wait_for_queue(dispatcher)
+
+    assert events == ["high0", "low0", "high1", "high2", "low1", "low2"]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_priorities_overflow(event_loop):
+    events = []
+    dispatcher = PriorityDispatcher(
+        size=2, workers=1, policy=OverflowPolicy.DROP_OLDEST
+    )
+    client = make_client(dispatcher, events)
+
+    client.dispatch("message", "high")
+    client.dispatch("guild_available", "low")
+    client.dispatch("ready", "normal")
+    await wait_for_queue(dispatcher)
+
+    assert events == ["high", "normal"]
+    assert dispatcher.dropped == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_extension_priorities(event_loop):
+    class FirstExtension(Extension):
+        @property
+        def event_priorities(self):
+            return {EventType.MEMBER_JOIN: Priority.NORMAL}
+
+    class SecondExtension(Extension):
+        @property
+        def event_priorities(self):
+            return {
+                EventType.MEMBER_JOIN: Priority.HIGH,
+                EventType.MESSAGE: Priority.LOW,
+            }
+
+    dispatcher = PriorityDispatcher()
+    client = Client(dispatcher=dispatcher)
+    assert dispatcher.get_priority(EventType.MEMBER_JOIN) == Priority.LOW
+    assert dispatcher.get_priority(EventType.MESSAGE) == Priority.HIGH
+    assert dispatcher.get_priority(EventType.READY) == Priority.NORMAL
+
+    client.extension_manager.register_extension(FirstExtension)
+    client.extension_manager.register_extension(SecondExtension)
+    assert dispatcher.get_priority(EventType.MEMBER_JOIN) == Priority.HIGH
+    assert dispatcher.get_priority(EventType.MESSAGE) == Priority.LOW
+    await client.close()
+
+
+def test_priorities_constraints():
+    with pytest.raises(ValueError):
+        PriorityDispatcher(weights={Priority.HIGH: 1})
+
+
+# Worker processes should be able to find these objects on unpickling.
+process_results = multiprocessing.Queue()
+process_closings = multiprocessing.Queue()
+
+
+class RecordClosing(Middleware):
+    async def run(self, *args, ctx, next, **kwargs):
+        return MiddlewareResult.IGNORE
+
+    async def close(self):
+        process_closings.put(os.getpid())
+
+
+async def record_in_process(*args, ctx, next, **kwargs):
+    payload = ctx.fields["payload"]
+    process_results.put((os.getpid(), payload.guild_id, payload.n))
+
+
+async def record_message_in_process(*args, ctx, next, **kwargs):
+    process_results.put(ctx.fields["message"].content)
+
+
+class ProcessExtension(Extension):
+    @property
+    def extension_middleware(self):
+        return [
+            collection_of(
+                OneOfAll,
+                [
+                    chain_of(
+                        [
+                            record_in_process,
+                            EventTypeFilter(EventType.RAW_REACTION_ADD),
+                        ]
+                    ),
+                    chain_of(
+                        [
+                            record_message_in_process,
+                            PatternFilter("hi"),
+                            BotFilter(authored_by_bot=False),
+                            EventTypeFilter(EventType.MESSAGE),
+                        ]
+                    ),
+                    RecordClosing(),
+                ],
+            )
+        ]
+
+
+def setup_process_manager(manager):
+    manager.register_extension(ProcessExtension)
+
+
+@pytest.mark.asyncio
+async def test_processes(event_loop):
+    dispatcher = ProcessDispatcher(setup_process_manager, processes=2)
+    client = Client(dispatcher=dispatcher)
+    assert client.extension_manager.is_extension_registered(ProcessExtension)
+
+    for n in range(4):
+        for guild_id in (1, 2):
+            payload = make_discord_object(n, guild_id=guild_id, n=n)
+            client.dispatch("raw_reaction_add", payload)
+    await client.close()
+
+    results = [process_results.get(timeout=5.0) for _ in range(8)]
+    assert os.getpid() not in {pid for pid, _, _ in results}
+
+    for guild_id in (1, 2):
+        guild_results = [r for r in results if r[1] == guild_id]
+        # Events of the same guild are processed by the same process, in order.
+        assert len({pid for pid, _, _ in guild_results}) == 1
+        assert [n for _, _, n in guild_results] == [0, 1, 2, 3]
+
+    # Both of worker processes and the client close their extension managers.
+    closings = {process_closings.get(timeout=5.0) for _ in range(3)}
+    assert os.getpid() in closings and len(closings) == 3
+
+
+@pytest.mark.asyncio
+async def test_processes_filters(event_loop):
+    dispatcher = ProcessDispatcher(setup_process_manager, processes=1)
+    client = Client(dispatcher=dispatcher)
+
+    for content, bot in (("hi", False), ("bye", False), ("hi bot", True)):
+        client.dispatch("message", make_guild_message(1, content, bot=bot))
+    await client.close()
+
+    assert process_results.get(timeout=5.0) == "hi"
+    with pytest.raises(queue.Empty):
+        process_results.get(timeout=0.1)
+    for _ in range(2):
+        process_closings.get(timeout=5.0)
+
+
+def test_processes_constraints():
+    with pytest.raises(ValueError):
+        ProcessDispatcher(setup_process_manager, processes=0)
@@ -0,0 +1,133 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import pytest
+
+from concord.middleware import (
+    MiddlewareChain,
+    MiddlewareResult,
+    MiddlewareSequence,
+    OneOfAll,
+    as_middleware,
+    chain_of,
+    collection_of,
+    sequence_of,
+)
+from concord.optimizer import (
+    TreeStats,
+    get_tree_stats,
+    optimize,
+    optimize_with_stats,
+)
+
+
+async def first_mw(*args, ctx, next, **kwargs):
+    return await next(*args, ctx=ctx, **kwargs) + 1
+
+
+async def second_mw(*args, ctx, next, **kwargs):
+    return await next(*args, ctx=ctx, **kwargs) * 2
+
+
+async def ignoring_mw(*args, ctx, next, **kwargs):
+    return MiddlewareResult.IGNORE
+
+
+async def next(*args, ctx, **kwargs):
+    return 42
+
+
+class CustomChain(MiddlewareChain):
+    pass
+
+
+def test_tree_stats():
+    mw = as_middleware(first_mw)
+    assert get_tree_stats(mw) == TreeStats(1, 1)
+    assert get_tree_stats(chain_of([])) == TreeStats(1, 1)
+    assert get_tree_stats(chain_of([mw, sequence_of([mw, mw])])) == TreeStats(
+        3, 5
+    )
+
+
+@pytest.mark.asyncio
+async def test_chains_flattening(context, sample_parameters):
+    sa, skwa = sample_parameters
+    first = as_middleware(first_mw)
+    second = as_middleware(second_mw)
+
+    inner = chain_of([chain_of([first]), second])
+    tree = chain_of([first, chain_of([]), inner, chain_of([second])])
+    optimized, before, after = optimize_with_stats(tree)
+
+    assert type(optimized) is MiddlewareChain
+    assert optimized.collection == [first, first, second, second]
+    assert before == TreeStats(4, 9) and after == TreeStats(2, 5)
+    # Given tree should not be modified
+    assert len(tree.collection) == 4 and len(inner.collection) == 2
+    assert await optimized.run(
+        *sa, ctx=context, next=next, **skwa
+    ) == await tree.run(*sa, ctx=context, next=next, **skwa)
+
+
+@pytest.mark.asyncio
+async def test_one_of_all_flattening(context, sample_parameters):
+    sa, skwa = sample_parameters
+    ignoring = as_middleware(ignoring_mw)
+    first = as_middleware(first_mw)
+
+    tree = collection_of(
+        OneOfAll,
+        [
+            ignoring,
+            sequence_of([]),
+            collection_of(OneOfAll, [ignoring, chain_of([first])]),
+        ],
+    )
+    optimized = optimize(tree)
+
+    assert type(optimized) is OneOfAll
+    assert optimized.collection == [ignoring, ignoring, first]
+    assert await optimized.run(*sa, ctx=context, next=next, **skwa) == 43
+
+
+def test_collapsing():
+    first = as_middleware(first_mw)
+
+    assert optimize(first) is first
+    assert optimize(chain_of([first])) is first
+    assert optimize(collection_of(OneOfAll, [first])) is first
+    assert optimize(chain_of([chain_of([chain_of([first])])])) is first
+
+
+def test_untouched_middleware():
+    first = as_middleware(first_mw)
+
+    # Sequences return a tuple of results, it can't be collapsed
+    optimized = optimize(sequence_of([chain_of([first])]))
+    assert type(optimized) is MiddlewareSequence
+    assert optimized.collection == [first]
+    # Subclasses can have own behavior
+    custom = collection_of(CustomChain, [chain_of([first])])
+    assert optimize(custom) is custom
+    assert optimize(chain_of([custom, first])).collection == [custom, first]
@@ -0,0 +1,148 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from typing import Sequence
+
+import pytest
+
+from concord.constants import EventType
+from concord.extension import Extension, Manager
+from concord.middleware import (
+    Middleware,
+    MiddlewareResult,
+    as_middleware,
+    chain_of,
+    sequence_of,
+)
+from concord.profiler import (
+    Histogram,
+    ProfiledMiddleware,
+    format_report,
+    profile,
+)
+from concord.utils import empty_next_callable
+
+
+async def slow_mw(*args, ctx, next, **kwargs):
+    await asyncio.sleep(0.02)
+    return await next(*args, ctx=ctx, **kwargs)
+
+
+async def handler(*args, ctx, next, **kwargs):
+    await asyncio.sleep(0.01)
+    return 42
+
+
+async def ignoring_mw(*args, ctx, next, **kwargs):
+    return MiddlewareResult.IGNORE
+
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+
+    for value in (0.0000005, 0.000003, 0.000003, 100):
+        histogram.record(value)
+    assert histogram.count == 4
+    assert histogram.buckets[0] == 1 and histogram.buckets[2] == 2
+    assert histogram.buckets[-1] == 1
+    assert histogram.percentile(50) == 0.000004
+    assert histogram.percentile(100) == float("inf")
+
+
+@pytest.mark.asyncio
+async def test_profiling(context, sample_parameters):
+    sa, skwa = sample_parameters
+    tree = sequence_of([chain_of([handler, slow_mw]), ignoring_mw])
+    inner_chain = tree.collection[0]
+
+    profiled = profile(tree)
+    assert isinstance(profiled, ProfiledMiddleware)
+    # Given tree should not be modified
+    assert tree.collection[0] is inner_chain
+    assert not isinstance(inner_chain.collection[0], ProfiledMiddleware)
+
+    for _ in range(2):
+        result = await profiled.run(
+            *sa, ctx=context, next=empty_next_callable, **skwa
+        )
+        assert result == (42, MiddlewareResult.IGNORE)
+
+    chain, ignoring = profiled.children
+    handler_node, slow_node = chain.children
+    assert [n.calls for n in (profiled, chain, ignoring, slow_node)] == [2] * 4
+    assert ignoring.ignored == 2 and chain.ignored == 0
+    assert handler_node.name.startswith("MiddlewareFunction(")
+    # Downstream time of the slow middleware is the handler's total time
+    assert slow_node.downstream_time == pytest.approx(
+        handler_node.total_time, abs=0.005
+    )
+    assert 0.035 < slow_node.self_time < 0.06
+    assert 0.015 < handler_node.self_time < 0.03
+    assert chain.self_time < 0.005 and profiled.self_time < 0.005
+
+    report = format_report(profiled).splitlines()
+    assert len(report) == 5
+    assert report[0].startswith("MiddlewareSequence: calls 2")
+    assert report[2].startswith("    MiddlewareFunction(")
+    assert "ignored 100.0%" in report[4]
+
+
+@pytest.mark.asyncio
+async def test_errors(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    async def failing_mw(*args, ctx, next, **kwargs):
+        raise RuntimeError()
+
+    profiled = profile(as_middleware(failing_mw))
+    with pytest.raises(RuntimeError):
+        await profiled.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert profiled.calls == 1 and profiled.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_profiling(context, sample_parameters):
+    sa, skwa = sample_parameters
+
+    class SomeExtension(Extension):
+        @property
+        def extension_middleware(self) -> Sequence[Middleware]:
+            return [as_middleware(handler)]
+
+    manager = Manager()
+    manager.register_extension(SomeExtension)
+    plan = manager.get_dispatch_plan(EventType.UNKNOWN)
+    assert not isinstance(plan, ProfiledMiddleware)
+
+    manager.enable_profiling()
+    await manager.run(*sa, ctx=context, next=empty_next_callable, **skwa)
+    assert manager.profiles[EventType.UNKNOWN].calls == 1
+    assert manager.format_profiles().startswith("UNKNOWN:\n  ")
+
+    manager.disable_profiling()
+    assert not isinstance(
+        manager.get_dispatch_plan(EventType.UNKNOWN), ProfiledMiddleware
+    )
+    assert EventType.UNKNOWN in manager.profiles
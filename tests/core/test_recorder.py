@@ -0,0 +1,170 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from concord.client import Client
+from concord.constants import EventType
+from concord.dispatcher import Dispatcher
+from concord.ext.base import (
+    BotFilter,
+    EventNormalization,
+    EventTypeFilter,
+    PatternFilter,
+)
+from concord.extension import Extension, Manager
+from concord.middleware import as_middleware, chain_of
+from concord.recorder import RecordingDispatcher, read_recording, replay
+from tests.helpers import make_discord_object, make_guild_message
+
+
+@pytest.fixture(scope="function")
+def recording(tmpdir):
+    return str(tmpdir.join("recording.jsonl"))
+
+
+@pytest.fixture(scope="function")
+def extension():
+    class SomeExtension(Extension):
+        events = []
+
+        @property
+        def extension_middleware(self):
+            @as_middleware
+            async def mw(*args, ctx, next, **kwargs):
+                SomeExtension.events.append(
+                    (ctx.event, list(ctx.args), ctx.kwargs)
+                )
+
+            return [mw]
+
+    return SomeExtension
+
+
+@pytest.mark.asyncio
+async def test_recording_and_replaying(event_loop, recording, extension):
+    dispatched = []
+
+    class SomeDispatcher(Dispatcher):
+        def dispatch(self, event, ctx):
+            dispatched.append(ctx)
+
+    dispatcher = RecordingDispatcher(SomeDispatcher(), recording)
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(extension)
+
+    message = make_discord_object(1, content="text")
+    client.dispatch("message", message, k="v")
+    await asyncio.sleep(0.05)
+    client.dispatch("firework!", 42)
+    await client.close()
+
+    assert len(dispatched) == 2 and dispatcher.recorded == 2
+
+    records = list(read_recording(recording))
+    assert [record[1:] for record in records] == [
+        (
+            "message",
+            [
+                {
+                    "content": "text",
+                    "created_at": "2015-01-01T00:00:00",
+                    "id": 1,
+                }
+            ],
+            {"k": "v"},
+        ),
+        ("firework!", [42], {}),
+    ]
+    assert records[1][0] - records[0][0] >= 0.05
+
+    manager = Manager()
+    manager.register_extension(extension)
+
+    count, failed, elapsed = await replay(recording, manager)
+    assert count == 2 and failed == 0 and elapsed < 0.05
+    assert extension.events == [
+        (
+            EventType.MESSAGE,
+            [
+                SimpleNamespace(
+                    content="text", created_at="2015-01-01T00:00:00", id=1
+                )
+            ],
+            {"k": "v"},
+        ),
+        (EventType.UNKNOWN, [42], {}),
+    ]
+
+    count, _, elapsed = await replay(recording, manager, realtime=True)
+    assert count == 2 and elapsed >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_replaying_through_filters(event_loop, recording):
+    handled = []
+
+    class SomeExtension(Extension):
+        @property
+        def client_middleware(self):
+            return [EventNormalization()]
+
+        @property
+        def extension_middleware(self):
+            async def mw(*args, ctx, next, **kwargs):
+                content = ctx.kwargs["message"].content
+                if content == "hi fail":
+                    raise RuntimeError()
+                handled.append(content)
+
+            human_filter = BotFilter(authored_by_bot=False)
+            event_filter = EventTypeFilter(EventType.MESSAGE)
+            return [
+                chain_of([mw, PatternFilter("hi"), human_filter, event_filter])
+            ]
+
+    class SomeDispatcher(Dispatcher):
+        def dispatch(self, event, ctx):
+            pass
+
+    dispatcher = RecordingDispatcher(SomeDispatcher(), recording)
+    client = Client(dispatcher=dispatcher)
+    client.extension_manager.register_extension(SomeExtension)
+    for content, bot in (
+        ("hi there", False),
+        ("hi bot", True),
+        ("bye", False),
+        ("hi fail", False),
+    ):
+        client.dispatch("message", make_guild_message(1, content, bot=bot))
+    await client.close()
+
+    manager = Manager()
+    manager.register_extension(SomeExtension)
+
+    count, failed, _ = await replay(recording, manager)
+    assert count == 4 and failed == 1
+    assert handled == ["hi there"]
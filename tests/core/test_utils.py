@@ -21,12 +21,60 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import datetime
+from types import SimpleNamespace
+
 import pytest
 
-from concord.utils import empty_next_callable
+from concord.constants import EventType
+from concord.utils import empty_next_callable, from_plain_data, to_plain_data
+from tests.helpers import make_discord_object, make_guild_message
 
 
 @pytest.mark.asyncio
 async def test_empty_next_callable_does_nothing(context, sample_parameters):
     sa, skwa = sample_parameters
     assert await empty_next_callable(*sa, ctx=context, **skwa) is None
+
+
+def test_to_plain_data():
+    when = datetime.datetime(2018, 1, 1)
+    deep = make_discord_object(3, inner=make_discord_object(4, value=5))
+    obj = make_discord_object(
+        1, name="name", items=(1, "2"), event=EventType.READY, deep=deep
+    )
+    obj._private = 42
+    obj.method = lambda: None
+
+    assert to_plain_data([obj, {"when": when, 6: None}]) == [
+        {
+            "id": 1,
+            "created_at": "2015-01-01T00:00:00",
+            "name": "name",
+            "items": [1, "2"],
+            "event": "ready",
+            "deep": {"id": 3, "created_at": "2015-01-01T00:00:00", "inner": 4},
+        },
+        {"when": "2018-01-01T00:00:00", 6: None},
+    ]
+
+
+def test_from_plain_data():
+    author = make_discord_object(2, bot=True)
+    message = make_discord_object(1, author=author, content="text")
+    converted = from_plain_data(to_plain_data([message, 42]))
+
+    assert converted[0].id == 1 and converted[0].content == "text"
+    assert converted[0].author.bot
+    assert converted[1] == 42
+    assert from_plain_data({1: {"a": 1}}) == {1: SimpleNamespace(a=1)}
+
+
+def test_to_plain_data_properties():
+    message = make_guild_message(1, "text", bot=True)
+    converted = from_plain_data(to_plain_data(message))
+
+    assert converted.id == 1 and converted.content == "text"
+    assert converted.author.id == 200 and converted.author.name == "name"
+    assert converted.author.bot
+    assert converted.guild.id == 100 and converted.channel.id == 300
@@ -40,7 +40,7 @@ async def test(client, authored_by_bot, bot):
     context = Context(
         client,
         event,
-        message=make_discord_object(0, author=make_discord_object(1, bot=bot)),
+        make_discord_object(0, author=make_discord_object(1, bot=bot)),
     )
 
     bf = BotFilter(authored_by_bot=authored_by_bot)
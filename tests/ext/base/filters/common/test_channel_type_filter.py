@@ -39,9 +39,7 @@ from tests.helpers import make_discord_object
 async def test_passing(client):
     event = EventType.MESSAGE
     channel = Mock(spec=discord.TextChannel)
-    context = Context(
-        client, event, message=make_discord_object(0, channel=channel)
-    )
+    context = Context(client, event, make_discord_object(0, channel=channel))
 
     ctf = ChannelTypeFilter(guild=True)
     assert isr(await ctf.run(ctx=context, next=empty_next_callable))
@@ -51,9 +49,7 @@ async def test_passing(client):
 async def test_ignoring(client):
     event = EventType.MESSAGE
     channel = Mock(spec=discord.DMChannel)
-    context = Context(
-        client, event, message=make_discord_object(0, channel=channel)
-    )
+    context = Context(client, event, make_discord_object(0, channel=channel))
 
     ctf = ChannelTypeFilter(guild=True)
     assert not isr(await ctf.run(ctx=context, next=empty_next_callable))
@@ -46,3 +46,10 @@ async def test_passing(client):
 
     etf = EventTypeFilter(event)
     assert isr(await etf.run(ctx=context, next=empty_next_callable))
+
+
+def test_event_types():
+    etf = EventTypeFilter(EventType.MESSAGE)
+    assert etf.event_types == {EventType.MESSAGE}
+    assert etf.can_process(EventType.MESSAGE)
+    assert not etf.can_process(EventType.READY)
@@ -37,9 +37,7 @@ async def test_simple_pattern(client):
     event = EventType.MESSAGE
     pattern = r"some text"
     content = "A message with some text to check"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     pf = PatternFilter(pattern)
     assert isr(await pf.run(ctx=context, next=empty_next_callable))
@@ -50,9 +48,7 @@ async def test_pattern_with_named_groups(client):
     event = EventType.MESSAGE
     pattern = r"find (?P<first>\w+) and (?P<second>\w+)"
     content = "It should find 42 and firework as first and second parameters"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     @m(PatternFilter(pattern))
     async def mw(*args, ctx, next, first, second, **kwargs):
@@ -67,9 +63,7 @@ async def test_pattern_with_named_groups_ignores_unnamed(client):
     event = EventType.MESSAGE
     pattern = r"find (\w+) and (?P<first>\w+)"
     content = "It should find 42 and firework but match only firework as first"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     @m(PatternFilter(pattern))
     async def mw(*args, ctx, next, first, **kwargs):
@@ -83,9 +77,7 @@ async def test_ignoring(client):
     event = EventType.MESSAGE
     pattern = r"some text"
     content = "A message without text to match"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     pf = PatternFilter(pattern)
     assert not isr(await pf.run(ctx=context, next=empty_next_callable))
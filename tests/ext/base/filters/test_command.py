@@ -21,16 +21,22 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import asyncio
+
 import pytest
 
 from concord.constants import EventType
 from concord.context import Context
 from concord.ext.base.filters.command import Command, CommandContextState
+from concord.extension import Extension, Manager
 from concord.middleware import (
+    MiddlewareConcurrentSequence,
+    MiddlewareSequence,
     MiddlewareState,
     chain_of,
     is_successful_result as isr,
     middleware as m,
+    race_of,
 )
 from concord.utils import empty_next_callable
 
@@ -41,9 +47,7 @@ from tests.helpers import make_discord_object
 async def test_simple_command(client):
     event = EventType.MESSAGE
     content = "   StAtuS the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = Command("status")
     assert isr(await c.run(ctx=context, next=empty_next_callable))
@@ -53,9 +57,7 @@ async def test_simple_command(client):
 async def test_context_is_restored_after_processing(client):
     event = EventType.MESSAGE
     content = "   StAtuS the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     @m(Command("status"))
     async def mw(*args, ctx, next, **kwargs):
@@ -76,9 +78,7 @@ async def test_simple_command_with_pattern(client):
     event = EventType.MESSAGE
     content = "status   42 and firework the rest should be ignored"
     pattern = r"(?P<first>\w+) and (?P<second>\w+)"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     @m(Command("status", rest_pattern=pattern))
     async def mw(*args, ctx, next, first, second, **kwargs):
@@ -93,9 +93,7 @@ async def test_simple_command_with_pattern_ignores_unnamed(client):
     event = EventType.MESSAGE
     content = "status 42 and firework the rest should be ignored"
     pattern = r"(\w+) and (?P<first>\w+)"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     @m(Command("status", rest_pattern=pattern))
     async def mw(*args, ctx, next, first, **kwargs):
@@ -108,9 +106,7 @@ async def test_simple_command_with_pattern_ignores_unnamed(client):
 async def test_ignoring(client):
     event = EventType.MESSAGE
     content = "prefix status the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = Command("status")
     assert not isr(await c.run(ctx=context, next=empty_next_callable))
@@ -121,9 +117,7 @@ async def test_ignoring_by_pattern(client):
     event = EventType.MESSAGE
     content = "status matched the rest should be ignored"
     pattern = r"unmatched"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = Command("status", rest_pattern=pattern)
     assert not isr(await c.run(ctx=context, next=empty_next_callable))
@@ -133,9 +127,7 @@ async def test_ignoring_by_pattern(client):
 async def test_command_nesting(client):
     event = EventType.MESSAGE
     content = "first    second the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = chain_of([Command("second"), Command("first")])
     assert isr(await c.run(ctx=context, next=empty_next_callable))
@@ -145,9 +137,7 @@ async def test_command_nesting(client):
 async def test_command_nesting_for_prefix(client):
     event = EventType.MESSAGE
     content = "prefixstatus the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = chain_of([Command("status"), Command("prefix", prefix=True)])
     assert isr(await c.run(ctx=context, next=empty_next_callable))
@@ -157,9 +147,49 @@ async def test_command_nesting_for_prefix(client):
 async def test_command_nesting_ignoring(client):
     event = EventType.MESSAGE
     content = "first unmatched the rest should be ignored"
-    context = Context(
-        client, event, message=make_discord_object(0, content=content)
-    )
+    context = Context(client, event, make_discord_object(0, content=content))
 
     c = chain_of([Command("second"), Command("first")])
     assert not isr(await c.run(ctx=context, next=empty_next_callable))
+
+
+def make_command_chain(value, delay=0.0):
+    async def handler(*args, ctx, next, **kwargs):
+        await asyncio.sleep(delay)
+        return value
+
+    return chain_of([handler, Command("ping"), Command("bot", prefix=True)])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "sequence_class", [MiddlewareSequence, MiddlewareConcurrentSequence]
+)
+async def test_commands_in_extensions(client, sequence_class):
+    def make_extension(value):
+        class SomeExtension(Extension):
+            @property
+            def extension_middleware(self):
+                return [make_command_chain(value)]
+
+        return SomeExtension
+
+    manager = Manager(sequence_class=sequence_class)
+    manager.register_extension(make_extension("A"))
+    manager.register_extension(make_extension("B"))
+
+    context = Context(
+        client, EventType.MESSAGE, make_discord_object(0, content="bot ping")
+    )
+    result = await manager.run(ctx=context, next=empty_next_callable)
+    assert "A" in result and "B" in result
+
+
+@pytest.mark.asyncio
+async def test_commands_in_race(client):
+    race = race_of([make_command_chain("A", 0.05), make_command_chain("B")])
+
+    context = Context(
+        client, EventType.MESSAGE, make_discord_object(0, content="bot ping")
+    )
+    assert await race.run(ctx=context, next=empty_next_callable) == "B"
@@ -0,0 +1,82 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.ext.base.batching import Batching
+
+
+def make_contexts(client, count):
+    return [Context(client, EventType.MESSAGE, i) for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_batching_by_size(client):
+    batches = []
+
+    async def handler(contexts):
+        batches.append([ctx.args[0] for ctx in contexts])
+
+    batching = Batching(handler, size=2, delay=10)
+    for ctx in make_contexts(client, 5):
+        assert await batching.run(ctx=ctx, next=None) is None
+
+    assert batches == [[0, 1], [2, 3]]
+    assert len(batching) == 1
+
+    await batching.close()
+    assert batches == [[0, 1], [2, 3], [4]]
+    assert batching.batches == 3 and len(batching) == 0
+
+
+@pytest.mark.asyncio
+async def test_batching_by_delay(client):
+    batches = []
+
+    def handler(contexts):
+        batches.append(len(contexts))
+        raise RuntimeError()
+
+    batching = Batching(handler, size=10, delay=0.01)
+    for ctx in make_contexts(client, 3):
+        await batching.run(ctx=ctx, next=None)
+    assert batches == []
+
+    # Exception should be logged only
+    await asyncio.sleep(0.03)
+    assert batches == [3]
+
+    await batching.run(ctx=make_contexts(client, 1)[0], next=None)
+    await batching.close()
+    assert batches == [3, 1]
+
+
+def test_constraints():
+    with pytest.raises(ValueError):
+        Batching(print, size=0)
+    with pytest.raises(ValueError):
+        Batching(print, delay=0)
@@ -0,0 +1,123 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.ext.base.cache import ResultCache
+from concord.middleware import MiddlewareResult
+
+
+def key(ctx, kwargs):
+    return kwargs.get("key")
+
+
+def make_next(calls, *, delay=0, result=None):
+    async def next(*args, ctx, **kwargs):
+        calls.append(kwargs.get("key"))
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return kwargs.get("key") if result is None else result
+
+    return next
+
+
+@pytest.mark.asyncio
+async def test_caching(client):
+    ctx = Context(client, EventType.MESSAGE)
+    calls = []
+    cache = ResultCache(key, size=2)
+    next = make_next(calls)
+
+    for k in (1, 2, 1, 3, 1, 2, None, None):
+        assert await cache.run(ctx=ctx, next=next, key=k) == k
+    # 2 is evicted as least recently used one
+    assert calls == [1, 2, 3, 2, None, None]
+    assert cache.hits == 2 and cache.misses == 4
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_unsuccessful_results(client):
+    ctx = Context(client, EventType.MESSAGE)
+    calls = []
+    cache = ResultCache(key)
+    next = make_next(calls, result=MiddlewareResult.IGNORE)
+
+    for _ in range(2):
+        result = await cache.run(ctx=ctx, next=next, key=1)
+        assert result == MiddlewareResult.IGNORE
+    assert calls == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_expiration(client):
+    ctx = Context(client, EventType.MESSAGE)
+    calls = []
+    cache = ResultCache(key, ttl=0.02)
+    next = make_next(calls)
+
+    await cache.run(ctx=ctx, next=next, key=1)
+    await cache.run(ctx=ctx, next=next, key=1)
+    await asyncio.sleep(0.03)
+    await cache.run(ctx=ctx, next=next, key=1)
+    assert calls == [1, 1]
+    assert cache.hits == 1 and cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_stampede_protection(client):
+    ctx = Context(client, EventType.MESSAGE)
+    calls = []
+    cache = ResultCache(key)
+
+    results = await asyncio.gather(
+        *(
+            cache.run(ctx=ctx, next=make_next(calls, delay=0.01), key=1)
+            for _ in range(5)
+        )
+    )
+    assert results == [1] * 5
+    assert calls == [1]
+    assert cache.hits == 4 and cache.misses == 1
+
+    failing = make_next(calls, delay=0.01, result=RuntimeError())
+    results = await asyncio.gather(
+        *(cache.run(ctx=ctx, next=failing, key=2) for _ in range(2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == [1, 2]
+    assert len(cache) == 1
+
+
+def test_constraints():
+    with pytest.raises(ValueError):
+        ResultCache(key, size=0)
@@ -0,0 +1,120 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.ext.base.dedup import Deduplication, event_identity
+from concord.middleware import MiddlewareResult
+from tests.helpers import make_discord_object
+
+
+async def next(*args, ctx, **kwargs):
+    return 42
+
+
+def test_event_identity(client):
+    message = make_discord_object(1)
+    edited = make_discord_object(1, edited_at=2)
+    user = make_discord_object(3)
+    reaction = make_discord_object(4, message=message, emoji="x")
+    payload = make_discord_object(5, message_id=1, user_id=3, emoji="x")
+
+    def identity(event, *args):
+        return event_identity(Context(client, event, *args))
+
+    assert identity(EventType.MESSAGE, message) == (EventType.MESSAGE, 1)
+    assert identity(EventType.MESSAGE_EDIT, message, edited) == (
+        EventType.MESSAGE_EDIT,
+        (1, 2),
+    )
+    assert identity(EventType.REACTION_ADD, reaction, user) == (
+        EventType.REACTION_ADD,
+        (1, "x", 3),
+    )
+    assert identity(EventType.RAW_REACTION_ADD, payload) == (
+        EventType.RAW_REACTION_ADD,
+        (1, 3, "x"),
+    )
+    assert identity(EventType.TYPING, user) is None
+    assert identity(EventType.MESSAGE) is None
+
+
+@pytest.mark.asyncio
+async def test_deduplication(client):
+    dedup = Deduplication(lambda ctx: ctx.args[0], window=0.02, size=2)
+
+    async def run(value):
+        ctx = Context(client, EventType.MESSAGE, value)
+        return await dedup.run(ctx=ctx, next=next)
+
+    assert [await run(v) for v in (1, 1, 2, None, 1)] == [
+        42,
+        MiddlewareResult.IGNORE,
+        42,
+        42,
+        MiddlewareResult.IGNORE,
+    ]
+    assert dedup.hits == 2
+    # The oldest one is forgotten, when the limit is reached
+    assert await run(3) == 42
+    assert len(dedup) == 2
+    assert await run(1) == 42
+
+    await asyncio.sleep(0.03)
+    assert await run(3) == 42
+    assert len(dedup) == 1
+
+
+@pytest.mark.asyncio
+async def test_reaction_readding(client):
+    message = make_discord_object(1)
+    user = make_discord_object(3)
+    reaction = make_discord_object(4, message=message, emoji="x")
+
+    async def next(*args, ctx, **kwargs):
+        return 42
+
+    dedup = Deduplication()
+    for event in (
+        EventType.REACTION_ADD,
+        EventType.REACTION_REMOVE,
+        EventType.REACTION_ADD,
+        EventType.REACTION_REMOVE,
+    ):
+        ctx = Context(client, event, reaction, user)
+        assert await dedup.run(ctx=ctx, next=next) == 42
+
+    ctx = Context(client, EventType.REACTION_REMOVE, reaction, user)
+    assert await dedup.run(ctx=ctx, next=next) == MiddlewareResult.IGNORE
+    assert dedup.hits == 1
+
+
+def test_constraints():
+    with pytest.raises(ValueError):
+        Deduplication(window=0)
+    with pytest.raises(ValueError):
+        Deduplication(size=0)
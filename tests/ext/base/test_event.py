@@ -75,3 +75,21 @@ async def test_unknown(client):
         assert len(ctx.kwargs) == len(skwa)
 
     await en.run(ctx=Context(client, event, *sa, **skwa), next=check)
+
+
+@pytest.mark.asyncio
+async def test_overridden_fields(client):
+    class SomeEventNormalization(EventNormalization):
+        EVENT_FIELDS = {EventType.MESSAGE: ("first", "second")}
+
+    en = SomeEventNormalization()
+
+    async def check(*args, ctx, **kwargs):
+        assert ctx.kwargs == {"first": 1, "second": 2}
+
+    await en.run(ctx=Context(client, EventType.MESSAGE, 1, 2), next=check)
+
+    async def check(*args, ctx, **kwargs):
+        assert ctx.kwargs == {}
+
+    await en.run(ctx=Context(client, EventType.READY, 1, 2), next=check)
@@ -0,0 +1,95 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2017-2018 Nariman Safiulin
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of
+this software and associated documentation files (the "Software"), to deal in
+the Software without restriction, including without limitation the rights to
+use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of
+the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+
+import pytest
+
+from concord.constants import EventType
+from concord.context import Context
+from concord.ext.base.ratelimit import RateLimit
+from concord.middleware import MiddlewareResult
+
+
+def key(ctx):
+    return ctx.args[0] if ctx.args else None
+
+
+async def next(*args, ctx, **kwargs):
+    return 42
+
+
+@pytest.mark.asyncio
+async def test_limiting(client):
+    limit = RateLimit(key, rate=50, burst=2)
+
+    async def run(*args):
+        ctx = Context(client, EventType.MESSAGE, *args)
+        return await limit.run(ctx=ctx, next=next)
+
+    assert [await run(1) for _ in range(3)] == [
+        42,
+        42,
+        MiddlewareResult.IGNORE,
+    ]
+    # Other keys have own buckets, and runs without key are not limited
+    assert await run(2) == 42
+    assert await run() == 42
+    assert limit.limited == 1
+
+    await asyncio.sleep(0.03)
+    assert await run(1) == 42
+    assert await run(1) == MiddlewareResult.IGNORE
+    assert limit.limited == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_buckets_expiration(client):
+    limit = RateLimit(key, rate=100, burst=1)
+
+    for i in range(10):
+        await limit.run(ctx=Context(client, EventType.MESSAGE, i), next=next)
+    assert len(limit) == 10
+
+    await asyncio.sleep(0.02)
+    await limit.run(ctx=Context(client, EventType.MESSAGE, 42), next=next)
+    assert len(limit) == 1
+
+
+@pytest.mark.asyncio
+async def test_on_limit(client):
+    async def on_limit(*args, ctx, next, **kwargs):
+        return "slow down"
+
+    limit = RateLimit(key, rate=1, on_limit=on_limit)
+    ctx = Context(client, EventType.MESSAGE, 1)
+
+    assert await limit.run(ctx=ctx, next=next) == 42
+    assert await limit.run(ctx=ctx, next=next) == "slow down"
+
+
+def test_constraints():
+    with pytest.raises(ValueError):
+        RateLimit(key, rate=0)
+    with pytest.raises(ValueError):
+        RateLimit(key, rate=1, burst=0)
@@ -39,3 +39,27 @@ def make_discord_object(id: int, **kwargs):
         setattr(obj, k, v)
 
     return obj
+
+
+def make_slotted_object(cls: type, **kwargs):
+    """Make an instance of given discord.py class with given attributes,
+    without calling its constructor."""
+    obj = cls.__new__(cls)
+
+    for k, v in kwargs.items():
+        setattr(obj, k, v)
+
+    return obj
+
+
+def make_guild_message(id: int, content: str, *, bot: bool = False):
+    """Make :class:`discord.Message` instance of a guild text channel, authored
+    by a guild member."""
+    guild = make_discord_object(100)
+    user = make_slotted_object(discord.User, id=200, name="name", bot=bot)
+    author = make_slotted_object(discord.Member, _user=user, guild=guild)
+    channel = make_slotted_object(discord.TextChannel, id=300, guild=guild)
+
+    return make_slotted_object(
+        discord.Message, id=id, content=content, author=author, channel=channel
+    )